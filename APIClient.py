@@ -123,7 +123,7 @@ class APIClient(object):
         except:
             print(error("[ERROR] Device not found"))
     
-    def get_playback_states(self, shuffle = "read", repeat = "read", playing = "read") -> str:
+    def get_playback_states(self, shuffle = "read", repeat = "read", playing = "read", playback: dict = None) -> str:
         '''
         A function that returns the current playback states of the active device (shuffle, repeat, and playing).
         
@@ -133,6 +133,8 @@ class APIClient(object):
             If repeat is `read`, it'll use the current repeat state. Otherwise, it'll use the given value (`track`, `context`, or `off`)
         :param playing:
             If playing is `read`, it'll use the current playing state. Otherwise, it'll use the given value (`true` or `false`)
+        :param playback:
+            An already fetched `current_playback()` result to read the states from. If not given, it'll be fetched from the API
             
         :return payload:
             The playback states in the following format:
@@ -140,7 +142,7 @@ class APIClient(object):
         '''
         
         payload: str = "[INIT]\t"
-        result: str  = self._api.current_playback()
+        result: dict = playback if (playback is not None) else self._api.current_playback()
         
         if (result is None):
             return "[ERROR] No playback active"
@@ -1,4 +1,9 @@
 import asyncio as aio
+import aiohttp
+try: # orjson has no PyPy build, the standard json module reads the same responses
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
 import websockets as ws
 import spotipy as sp
 import signal
@@ -6,95 +11,147 @@ import curses
 import sys
 import os
 import time
-import requests
 from datetime import datetime
-import threading
+import queue
+from concurrent.futures import ThreadPoolExecutor
+import logging
+from logging.handlers import QueueHandler, QueueListener
+from cachetools import TTLCache
 
 from APIClient import APIClient  # The class that handles the Spotify API and custom functions
-from resonite_ui import SpotipyUI
+from resonite_ui import SpotipyUI, UILogHandler
 # Import the color extraction module
 import spotify_color
 
+# Server logs are put on a queue, so handlers never wait on curses rendering. curses_main drains it into the UI
+# Messages are formatted lazily, so suppressed debug messages cost next to nothing
+log = logging.getLogger("resopy")
+LOG_QUEUE: queue.SimpleQueue = queue.SimpleQueue()
+log.addHandler(QueueHandler(LOG_QUEUE))
+log.propagate = False # Keep log output off the terminal curses is drawing on
+
 # Global variables
 API: sp.Spotify = None
 CLIENT: APIClient = None
 PORT: int = 0000
 UI = None
 DEBUG = False
-# Cache for canvas and artist data to avoid redundant checks
-TRACK_CACHE = {}
+SESSION: aiohttp.ClientSession = None
+PAYLOAD_SEPARATOR: str = "\x1e" # ASCII record separator, the Resonite client splits merged payloads on it
+# Caches for canvas and artist data to avoid redundant checks. Entries expire so rotated CDN URLs
+# get refreshed, and the size is bounded so a long-running server doesn't grow forever.
+# A cached None means "checked, nothing found" and is told apart from a miss with _MISSING
+CANVAS_CACHE: TTLCache = TTLCache(maxsize=2048, ttl=3600)
+ARTIST_CACHE: TTLCache = TTLCache(maxsize=2048, ttl=86400)
+_MISSING = object()
 CURRENT_TRACK_ID = None
 
-def get_spotify_canvas(track_id):
-    """Fetch Spotify Canvas video for a given track ID"""
-    # Check if we already have cached data for this track
-    if track_id in TRACK_CACHE and "canvas_checked" in TRACK_CACHE[track_id]:
-        return TRACK_CACHE[track_id].get("canvas_data")
+# Websocket command groups, one per handler
+_CURRENT_CMDS  = frozenset({"current_info", "current_song", "current_states"})
+_TRACK_CMDS    = frozenset({"next", "previous", "play"})
+_STATE_CMDS    = frozenset({"pause", "resume", "shuffle", "repeat"})
+_LIST_CMDS     = frozenset({"list_playlists", "search", "list_queue"})
+_DISPLAY_CMDS  = frozenset({"display_album", "display_playlist", "display_artist"})
+_MEDIA_CMDS    = frozenset({"get_canvas_video", "get_artist_image", "get_track_color"})
+_TOGGLE_CMDS   = frozenset({"pause", "resume"})
+_SNAPSHOT_CMDS = frozenset({"current_states"}) # Responses that can be dropped when a client falls behind
+# Commands that change the playback or DISPLAY, run one at a time per client in the order they were sent
+_ORDERED_CMDS  = _TRACK_CMDS | _STATE_CMDS | _LIST_CMDS | _DISPLAY_CMDS
+# Latest current_playback() snapshot, refreshed by _poll_state and shared by every client
+GLOBAL_STATE: dict = None
+_STATE_VERSION: int = 0 # Bumped by invalidate_state, so results built before a command are never reused
+GLOBAL_STATE_VERSION: int = 0 # _STATE_VERSION when GLOBAL_STATE was fetched, it's outdated once they differ
+_STATE_REFRESH: aio.Task = None # A refresh of GLOBAL_STATE in progress, shared by every reader waiting for it
+_PUSHED_TRACK_ID: str = None # Track whose info was last pushed to every client
+POLL_INTERVAL: float = 1.0
+CLIENT_QUEUES: set = set() # Outbound queues of connected clients, for pushing track changes
+MAX_PENDING_COMMANDS: int = 4 # Commands a single client can have running at once
+SPOTIFY_RATE: float = 10 # Spotify API calls per second, across all clients
+SPOTIFY_RETRIES: int = 1 # Extra attempts after a 429 response
+STATES_DEBOUNCE: float = 0.5 # Seconds a current_states result is reused for
+_LAST_STATES: str = None
+_LAST_STATES_AT: float = 0.0
+_LAST_STATES_VERSION: int = -1 # _STATE_VERSION the debounced states were built from
+
+class LeakyBucket(object):
+    '''
+    A leaky bucket rate limiter that lets one call through every `1 / rate` seconds, in the order they arrived.
+    '''
+    
+    def __init__(self, rate: float):
+        '''
+        :param rate:
+            The maximum number of calls per second
+        '''
+        self._interval: float = 1 / rate
+        self._next: float     = 0.0
+    
+    async def acquire(self):
+        '''
+        Waits until the next free slot. Slots are reserved before sleeping, so concurrent callers queue up behind each other.
+        '''
+        now: float  = time.monotonic()
+        slot: float = max(now, self._next)
+        self._next  = slot + self._interval
         
+        if (slot > now):
+            await aio.sleep(slot - now)
+
+SPOTIFY_LIMITER = LeakyBucket(rate=SPOTIFY_RATE)
+
+# Runs a blocking Spotify API call in a worker thread once the rate limiter allows it.
+# If Spotify still answers with 429 (spotipy already retries a few times itself), waits for the
+# Retry-After time with exponential backoff and tries again
+async def spotify_call(action: callable, *args, **kwargs):
+    for attempt in range(SPOTIFY_RETRIES + 1):
+        await SPOTIFY_LIMITER.acquire()
+        try:
+            return await aio.to_thread(action, *args, **kwargs)
+        except sp.SpotifyException as e:
+            if (e.http_status != 429) or (attempt == SPOTIFY_RETRIES):
+                raise
+            retry_after = float((e.headers or {}).get("Retry-After", 1))
+            log.info("Rate limited by Spotify, retrying in %.0fs", retry_after)
+            await aio.sleep(retry_after * (2 ** attempt))
+
+async def _fetch_spotify_canvas(session: aiohttp.ClientSession, track_id):
+    """Fetch Spotify Canvas video for a given track ID, returning None if there isn't one"""
     try:
         url = f"https://spotifycanvas-indol.vercel.app/api/canvas?trackId={track_id}"
-        response = requests.get(url)
-        if response.status_code == 200:
-            data = response.json()
-            if data and "canvasesList" in data and len(data["canvasesList"]) > 0:
-                canvas_data = data["canvasesList"][0]
-                result = {
-                    "canvasUrl": canvas_data.get("canvasUrl"),
-                    "artistImgUrl": canvas_data.get("artist", {}).get("artistImgUrl")
-                }
-                
-                # Initialize track cache if needed
-                if track_id not in TRACK_CACHE:
-                    TRACK_CACHE[track_id] = {}
-                
-                # Store the canvas data and mark as checked
-                TRACK_CACHE[track_id]["canvas_data"] = result
-                TRACK_CACHE[track_id]["canvas_checked"] = True
-                
-                return result
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=5)) as response:
+            data = json_loads(await response.read()) if response.status == 200 else None
+        if data and "canvasesList" in data and len(data["canvasesList"]) > 0:
+            canvas_data = data["canvasesList"][0]
+            return {
+                "canvasUrl": canvas_data.get("canvasUrl"),
+                "artistImgUrl": canvas_data.get("artist", {}).get("artistImgUrl")
+            }
     except Exception as e:
-        if UI:
-            UI.add_log(f"[ERROR] Error fetching canvas: {str(e)}")
-    
-    # Mark as checked even if no data found
-    if track_id not in TRACK_CACHE:
-        TRACK_CACHE[track_id] = {}
-    TRACK_CACHE[track_id]["canvas_checked"] = True
-    TRACK_CACHE[track_id]["canvas_data"] = None
+        log.error("[ERROR] Error fetching canvas: %s", e)
     
     return None
 
-def get_artist_image(artist_id):
-    """Get artist image from Spotify API with caching"""
-    # Check cache first
-    if artist_id in TRACK_CACHE and "artist_image_checked" in TRACK_CACHE[artist_id]:
-        return TRACK_CACHE[artist_id].get("artist_image")
-        
-    try:
-        artist_data = API.artist(artist_id)
-        if artist_data and artist_data.get("images") and len(artist_data["images"]) > 0:
-            artist_img_url = artist_data["images"][0]["url"]
-            
-            # Initialize artist cache if needed
-            if artist_id not in TRACK_CACHE:
-                TRACK_CACHE[artist_id] = {}
-            
-            # Store the artist image and mark as checked
-            TRACK_CACHE[artist_id]["artist_image"] = artist_img_url
-            TRACK_CACHE[artist_id]["artist_image_checked"] = True
-            
-            return artist_img_url
-    except Exception as e:
-        if UI:
-            UI.add_log(f"[ERROR] Error fetching artist image: {str(e)}")
-    
-    # Mark as checked even if no data found
-    if artist_id not in TRACK_CACHE:
-        TRACK_CACHE[artist_id] = {}
-    TRACK_CACHE[artist_id]["artist_image_checked"] = True
-    TRACK_CACHE[artist_id]["artist_image"] = None
-    
-    return None
+async def get_spotify_canvas(session: aiohttp.ClientSession, track_id):
+    """Fetch Spotify Canvas video for a given track ID with caching"""
+    # Coroutines can't go through cachetools.cached, so the cache is checked by hand
+    cached = CANVAS_CACHE.get(track_id, _MISSING)
+    if cached is _MISSING:
+        cached = CANVAS_CACHE[track_id] = await _fetch_spotify_canvas(session, track_id)
+    return cached
+
+async def get_artist_image(artist_id):
+    """Get artist image from Spotify API with caching, returning None if the artist has none"""
+    # Checked by hand like the canvas cache, so a miss goes through spotify_call and its rate limiter
+    cached = ARTIST_CACHE.get(artist_id, _MISSING)
+    if cached is _MISSING:
+        try:
+            artist_data = await spotify_call(API.artist, artist_id)
+        except Exception as e:
+            log.error("[ERROR] Error fetching artist image: %s", e)
+            return None # Not cached, so the next request tries again
+        images = artist_data.get("images") if artist_data else None
+        cached = ARTIST_CACHE[artist_id] = images[0]["url"] if images else None
+    return cached
 
 def current_time():
     return f"[{datetime.now():%H:%M:%S}]"
@@ -146,24 +203,24 @@ Port ID: 6969"""
 def connect_to_spotify():
     global API, CLIENT, PORT
     
-    results: list[str | int] = ["", "", "", 0]
-    indices: list[int]       = [1, 2, 5, 9]
+    # Lines are "Key: value" pairs, values might still be wrapped in <> from the template
+    cfg: dict[str, str] = {}
     
     with open("IDs.txt") as file:
-        lines: list[str] = file.readlines()
+        for line in file:
+            if (":" in line) and (not line.startswith("#")):
+                key, _, value = line.partition(":")
+                cfg[key.strip()] = value.strip(" <>\n\r")
     
-    for i in range(0, 4):
-        results[i] = lines[indices[i]].split(" ")[2].removesuffix("\n").replace("<", "").replace(">", "")
-        i += 1
-    PORT = int(results[3])
+    PORT = int(cfg["Port ID"])
     
-    if (str(results[3]) in results[2]):
+    if (cfg["Port ID"] in cfg["Redirect URI"]):
         raise Exception(f"Invalid port! ({PORT = }). Use a different port than the one used by the callback URI.")
     
     _ = """user-library-modify,user-library-read,user-read-currently-playing,user-read-playback-position,
             user-read-playback-state,user-modify-playback-state,app-remote-control,streaming,playlist-read-private,
             playlist-modify-private,playlist-modify-public,playlist-read-collaborative"""
-    CLIENT = APIClient(results[0], results[1], results[2], _)
+    CLIENT = APIClient(cfg["Client ID"], cfg["Client Secret"], cfg["Redirect URI"], _)
     API = CLIENT._api
     CLIENT._debug = DEBUG
     
@@ -171,15 +228,77 @@ def connect_to_spotify():
     
     return True
 
+# Fetches the canvas, artist image and album color of a track concurrently
+async def get_track_media(track_item: dict) -> tuple:
+    artist_id = track_item['artists'][0]['id']
+    album_art_url = None
+    if track_item.get('album') and track_item['album'].get('images'):
+        album_art_url = track_item['album']['images'][0]['url']
+    
+    # get_dominant_color is skipped (aio.sleep(0) resolves to None) when the album has no artwork
+    canvas_data, artist_img_url, color_hex = await aio.gather(
+        get_spotify_canvas(SESSION, track_item['id']),
+        get_artist_image(artist_id),
+        aio.to_thread(spotify_color.get_dominant_color, album_art_url) if album_art_url else aio.sleep(0)
+    )
+    
+    return canvas_data, artist_img_url, color_hex
+
+# Marks GLOBAL_STATE as outdated after a command changed the playback, instead of waiting up to POLL_INTERVAL
+def invalidate_state():
+    global _STATE_VERSION
+    _STATE_VERSION += 1
+
+# Fetches GLOBAL_STATE again. Only one runs at a time, readers arriving meanwhile wait for the same one
+async def _refresh_state():
+    global GLOBAL_STATE, GLOBAL_STATE_VERSION, _STATE_REFRESH
+    
+    version = _STATE_VERSION # Taken before the call, a command finishing meanwhile leaves the result outdated
+    try:
+        state = await spotify_call(API.current_playback)
+        if version >= GLOBAL_STATE_VERSION:
+            GLOBAL_STATE, GLOBAL_STATE_VERSION = state, version
+    finally:
+        _STATE_REFRESH = None
+
+# Returns GLOBAL_STATE, fetching it again first if a command changed the playback since it was fetched
+async def get_global_state() -> dict:
+    global _STATE_REFRESH
+    
+    while GLOBAL_STATE_VERSION != _STATE_VERSION:
+        if _STATE_REFRESH is None:
+            _STATE_REFRESH = aio.create_task(_refresh_state())
+        await aio.shield(_STATE_REFRESH) # A reader giving up mustn't cancel the refresh for the others
+    return GLOBAL_STATE
+
+# Returns the playback states, reusing the last result if it was asked for within STATES_DEBOUNCE seconds
+# and no command changed the playback since. Clients poll this much faster than the states actually change
+async def get_current_states() -> str:
+    global _LAST_STATES, _LAST_STATES_AT, _LAST_STATES_VERSION
+    
+    if (_LAST_STATES and (_LAST_STATES_VERSION == _STATE_VERSION)
+            and (time.monotonic() - _LAST_STATES_AT < STATES_DEBOUNCE)):
+        return _LAST_STATES
+    
+    state = await get_global_state()
+    version = _STATE_VERSION # The version of state, a command finishing from here on makes these outdated
+    if state:
+        states = CLIENT.get_playback_states(playback=state)
+    else:
+        states = await spotify_call(CLIENT.get_playback_states)
+    
+    _LAST_STATES, _LAST_STATES_AT, _LAST_STATES_VERSION = states, time.monotonic(), version
+    return states
+
 # Displays current information about the currently playing track and/or the playback states
-def display_current_info(received: str) -> str:
+async def display_current_info(received: str) -> str:
     global CURRENT_TRACK_ID
     payload: str = ""
     
     match (received):
         case "current_info": # Used for getting the currently playing track and the playback states
             try:
-                track_data = API.current_user_playing_track()
+                track_data = await get_global_state()
                 track_item = track_data['item'] # Throws an error if there's no currently playing track
                 track_id = track_item['id']
                 
@@ -187,52 +306,37 @@ def display_current_info(received: str) -> str:
                 track_changed = CURRENT_TRACK_ID != track_id
                 CURRENT_TRACK_ID = track_id
                 
-                # Get canvas data if available
-                canvas_data = get_spotify_canvas(track_id)
+                # Get canvas data, artist image and track color at the same time
+                canvas_data, artist_img_url, color_hex = await get_track_media(track_item)
+                states = CLIENT.get_playback_states(playback=track_data)
+                
                 if track_changed:
                     if canvas_data and canvas_data.get("canvasUrl"):
-                        if UI:
-                            UI.add_log(f"Canvas URL found: {canvas_data['canvasUrl'][:30]}...")
+                        log.info("Canvas URL found: %s...", canvas_data['canvasUrl'][:30])
                     else:
-                        if UI:
-                            UI.add_log("No canvas found for current playing song")
-                
-                # Get artist image
-                artist_id = track_item['artists'][0]['id']
-                artist_img_url = get_artist_image(artist_id)
-                if track_changed and artist_img_url:
-                    if UI:
-                        UI.add_log(f"Artist image URL: {artist_img_url[:30]}...")
-                
-                # Get track color
-                if track_changed and track_item.get('album') and track_item['album'].get('images'):
-                    album_art_url = track_item['album']['images'][0]['url']
-                    color_hex = spotify_color.get_dominant_color(album_art_url)
+                        log.info("No canvas found for current playing song")
+                    if artist_img_url:
+                        log.info("Artist image URL: %s...", artist_img_url[:30])
                     if color_hex:
-                        if UI:
-                            UI.add_log(f"Track color: {color_hex}")
+                        log.info("Track color: %s", color_hex)
                 
-                payload = CLIENT.get_track_data(track_data, ws_call="current") + "\n" + CLIENT.get_playback_states()
+                payload = CLIENT.get_track_data(track_data, ws_call="current") + "\n" + states
                 
                 # Append canvas and artist data if available
                 if canvas_data and canvas_data.get("canvasUrl"):
                     payload += f"\nCANVAS_URL:{canvas_data['canvasUrl']}"
                 if artist_img_url:
                     payload += f"\nARTIST_IMG_URL:{artist_img_url}"
-                if track_item.get('album') and track_item['album'].get('images'):
-                    album_art_url = track_item['album']['images'][0]['url']
-                    color_hex = spotify_color.get_dominant_color(album_art_url)
-                    if color_hex:
-                        payload += f"\nTRACK_COLOR:{color_hex}"
+                if color_hex:
+                    payload += f"\nTRACK_COLOR:{color_hex}"
                 
             except Exception as e:
-                if UI:
-                    UI.add_log(f"[ERROR] No current song active: {str(e)}")
+                log.error("[ERROR] No current song active: %s", e)
                 payload = "[ERROR] No current song active"
         
         case "current_track":
             try:
-                track_data = API.current_user_playing_track()
+                track_data = await get_global_state()
                 track_item = track_data['item'] # Throws an error if there's no currently playing track
                 track_id = track_item['id']
                 
@@ -240,30 +344,18 @@ def display_current_info(received: str) -> str:
                 track_changed = CURRENT_TRACK_ID != track_id
                 CURRENT_TRACK_ID = track_id
                 
-                # Get canvas data if available
-                canvas_data = get_spotify_canvas(track_id)
+                # Get canvas data, artist image and track color at the same time
+                canvas_data, artist_img_url, color_hex = await get_track_media(track_item)
+                
                 if track_changed:
                     if canvas_data and canvas_data.get("canvasUrl"):
-                        if UI:
-                            UI.add_log(f"Canvas URL found: {canvas_data['canvasUrl']}")
+                        log.info("Canvas URL found: %s", canvas_data['canvasUrl'])
                     else:
-                        if UI:
-                            UI.add_log("No canvas found for current playing song")
-                
-                # Get artist image
-                artist_id = track_item['artists'][0]['id']
-                artist_img_url = get_artist_image(artist_id)
-                if track_changed and artist_img_url:
-                    if UI:
-                        UI.add_log(f"Artist image URL: {artist_img_url}")
-                
-                # Get track color
-                if track_changed and track_item.get('album') and track_item['album'].get('images'):
-                    album_art_url = track_item['album']['images'][0]['url']
-                    color_hex = spotify_color.get_dominant_color(album_art_url)
+                        log.info("No canvas found for current playing song")
+                    if artist_img_url:
+                        log.info("Artist image URL: %s", artist_img_url)
                     if color_hex:
-                        if UI:
-                            UI.add_log(f"Track color: {color_hex}")
+                        log.info("Track color: %s", color_hex)
                 
                 payload = CLIENT.get_track_data(track_data, ws_call="current")
                 
@@ -272,56 +364,47 @@ def display_current_info(received: str) -> str:
                     payload += f"\nCANVAS_URL:{canvas_data['canvasUrl']}"
                 if artist_img_url:
                     payload += f"\nARTIST_IMG_URL:{artist_img_url}"
-                if track_item.get('album') and track_item['album'].get('images'):
-                    album_art_url = track_item['album']['images'][0]['url']
-                    color_hex = spotify_color.get_dominant_color(album_art_url)
-                    if color_hex:
-                        payload += f"\nTRACK_COLOR:{color_hex}"
+                if color_hex:
+                    payload += f"\nTRACK_COLOR:{color_hex}"
                 
             except:
-                if UI:
-                    UI.add_log("No current song active")
+                log.info("No current song active")
                 payload = "[ERROR] No current song active"
         
         case "current_states":
             try:
-                payload = CLIENT.get_playback_states()
+                payload = await get_current_states()
             except:
-                if UI:
-                    UI.add_log("Error getting playback states")
+                log.error("Error getting playback states")
                 payload = "[ERROR] Error getting playback states"
     
     return payload
 
 # Modifies the currently playing track, like going to the next or previous song, or playing a new song
-def modify_current_track(received: str, data: str) -> str:
+async def modify_current_track(received: str, data: str) -> str:
     payload: str = ""
     
     match (received):
         case "next":
             try:
-                CLIENT.run_action(API.next_track)
-                if UI:
-                    UI.add_log("Next track")
+                await spotify_call(CLIENT.run_action, API.next_track)
+                log.info("Next track")
                 payload = "[NEXT SONG]"
             except Exception as e:
-                if UI:
-                    UI.add_log(f"[ERROR] Error going to next song: {str(e)}")
+                log.error("[ERROR] Error going to next song: %s", e)
                 payload = "[ERROR] Error going to next song"
         
         case "previous":
             try:
-                if (API.current_playback()["progress_ms"] > 4000):
-                    CLIENT.run_action(API.seek_track, 0)
+                if ((await spotify_call(API.current_playback))["progress_ms"] > 4000):
+                    await spotify_call(CLIENT.run_action, API.seek_track, 0)
                 else:
-                    CLIENT.run_action(API.previous_track)
+                    await spotify_call(CLIENT.run_action, API.previous_track)
                 
-                if UI:
-                    UI.add_log("Previous track")
+                log.info("Previous track")
                 payload = "[PREVIOUS SONG]"
             except Exception as e:
-                if UI:
-                    UI.add_log(f"[ERROR] Error going to previous song: {str(e)}")
+                log.error("[ERROR] Error going to previous song: %s", e)
                 payload = "[ERROR] Error going to previous song"
         
         case "play":
@@ -334,102 +417,94 @@ def modify_current_track(received: str, data: str) -> str:
                     match (DISPLAY):
                         case "search":
                             if (play_data[0] == "track"):
-                                API.start_playback(uris=[play_data[1]]) # Plays just the selected song
-                                if UI:
-                                    UI.add_log(f"Playing selected searched song")
+                                await spotify_call(API.start_playback, uris=[play_data[1]]) # Plays just the selected song
+                                log.info("Playing selected searched song")
                                 payload = "[PLAY] Played selected searched song"
                         
                         case "queue":
-                            API.start_playback(context_uri=API.currently_playing()["context"]["uri"], offset={"uri": play_data[1]}) # Plays song in the queue that was clicked on
-                            if UI:
-                                UI.add_log(f"Playing selected song in queue")
+                            context_uri = (await spotify_call(API.currently_playing))["context"]["uri"]
+                            await spotify_call(API.start_playback, context_uri=context_uri, offset={"uri": play_data[1]}) # Plays song in the queue that was clicked on
+                            log.info("Playing selected song in queue")
                             payload = "[PLAY] Played selected song in queue"
                         
                         case "playlist" | "album":
                             if (len(play_data) == 3):
-                                API.start_playback(context_uri=play_data[1], offset={"uri": play_data[2]}) # Plays song in the playlist/album that was clicked on
-                                if UI:
-                                    UI.add_log(f"Playing selected song in playlist/album")
+                                await spotify_call(API.start_playback, context_uri=play_data[1], offset={"uri": play_data[2]}) # Plays song in the playlist/album that was clicked on
+                                log.info("Playing selected song in playlist/album")
                                 payload = "[PLAY] Played selected song in playlist/album"
                             else:
-                                API.start_playback(context_uri=play_data[1]) # Plays the playlist/album that was clicked on
-                                if UI:
-                                    UI.add_log(f"Playing selected playlist/album")
+                                await spotify_call(API.start_playback, context_uri=play_data[1]) # Plays the playlist/album that was clicked on
+                                log.info("Playing selected playlist/album")
                                 payload = "[PLAY] Played selected playlist/album"
                         
                 except:
-                    if UI:
-                        UI.add_log("Error playing song")
+                    log.error("Error playing song")
                     payload = "[ERROR] Error playing song"
-
+    
+    invalidate_state()
     return payload
 
 # Modifies the playback states, like pausing, resuming, or changing the shuffle state
-def modify_playback_states(received: str) -> str:
+async def modify_playback_states(received: str) -> str:
     payload: str = ""
     
-    if (received == "pause" or received == "resume"):
+    if (received in _TOGGLE_CMDS):
         try:
-            _ = API.current_user_playing_track()['is_playing']
+            _ = (await spotify_call(API.current_user_playing_track))['is_playing']
         except:
             _ = False
         
         playing = "False" if _ else "True"
         
         try:
-            CLIENT.run_action(API.pause_playback) if _ else CLIENT.run_action(API.start_playback)
+            await spotify_call(CLIENT.run_action, API.pause_playback if _ else API.start_playback)
             
-            if UI:
-                UI.add_log(f"Playback {'paused' if _ else 'resumed'}")
+            log.info("Playback %s", 'paused' if _ else 'resumed')
             
-            payload = CLIENT.get_playback_states(playing=playing)
+            payload = await spotify_call(CLIENT.get_playback_states, playing=playing)
         except Exception as e:
-            if UI:
-                UI.add_log(f"[ERROR] Error {'pausing' if _ else 'resuming'} playback: {str(e)}")
+            log.error("[ERROR] Error %s playback: %s", 'pausing' if _ else 'resuming', e)
             payload = "[ERROR] Error pausing/resuming playback"
              
     match (received):       
         case "shuffle":
             try:
-                shuffle: bool = API.current_playback()["shuffle_state"]
-                CLIENT.run_action(API.shuffle, not shuffle) # Throws an error if it can't change the shuffle state
+                shuffle: bool = (await spotify_call(API.current_playback))["shuffle_state"]
+                await spotify_call(CLIENT.run_action, API.shuffle, not shuffle) # Throws an error if it can't change the shuffle state
                 
-                if UI:
-                    UI.add_log(f"Shuffle {'disabled' if shuffle else 'enabled'}")
+                log.info("Shuffle %s", 'disabled' if shuffle else 'enabled')
                 
-                payload = CLIENT.get_playback_states(shuffle=str(not shuffle))
+                payload = await spotify_call(CLIENT.get_playback_states, shuffle=str(not shuffle))
             except Exception as e:
-                if UI:
-                    UI.add_log(f"[ERROR] Error changing shuffle state: {str(e)}")
+                log.error("[ERROR] Error changing shuffle state: %s", e)
                 payload = "[ERROR] Error changing shuffle state"
         
         case "repeat":
             try:
                 states: list[str] = ["track", "context", "off"]
-                repeat: str       = API.current_playback()["repeat_state"]
+                repeat: str       = (await spotify_call(API.current_playback))["repeat_state"]
                 change: str       = states[(states.index(repeat) + 1) if (repeat != "off") else 0]
-                CLIENT.run_action(API.repeat, change) # Throws an error if it can't change the repeat state
+                await spotify_call(CLIENT.run_action, API.repeat, change) # Throws an error if it can't change the repeat state
 
-                if UI:
-                    UI.add_log(f"Repeat mode: {change.capitalize()}")
+                log.info("Repeat mode: %s", change.capitalize())
 
-                payload = CLIENT.get_playback_states(repeat=change.capitalize())
+                payload = await spotify_call(CLIENT.get_playback_states, repeat=change.capitalize())
             except:
-                if UI:
-                    UI.add_log("Error changing repeat state")
+                log.error("Error changing repeat state")
                 payload = "[ERROR] Error changing repeat state"
     
+    invalidate_state()
     return payload
 
 # Lists results stuff, such as playlists, currently playing queue, or search results
-def list_stuff(received: str, data: str) -> str:
+async def list_stuff(received: str, data: str) -> str:
     global DISPLAY
     payload: str = ""
     
     match (received):
         case "list_playlists":
             DISPLAY = "playlists"
-            payload = CLIENT.get_playlists()
+            payload = await spotify_call(CLIENT.get_playlists)
 
         case "search":
             try:
@@ -437,10 +512,9 @@ def list_stuff(received: str, data: str) -> str:
                 search_data: list[str] = data.split(" ") # Format: "<type> <search query>"
                 
                 if (len(search_data) > 1):
-                    if UI:
-                        UI.add_log(f"Searching for {search_data[0]}: {' '.join(search_data[1:])}")
+                    log.info("Searching for %s: %s", search_data[0], ' '.join(search_data[1:]))
                     
-                    search_results = API.search(" ".join(search_data[1:]), type=search_data[0], market="US") # Valid arguments for type: "track", "album", "track,album"
+                    search_results = await spotify_call(API.search, " ".join(search_data[1:]), type=search_data[0], market="US") # Valid arguments for type: "track", "album", "track,album"
                     
                     search_split = search_data[0].split(",")
                     if (len(search_split) > 1): # If the search is for more than one type
@@ -453,27 +527,25 @@ def list_stuff(received: str, data: str) -> str:
                     else:
                         payload = CLIENT.get_results(search_results[f"{search_data[0]}s"], ws_call="search")
             except:
-                if UI:
-                    UI.add_log("Error searching")
+                log.error("Error searching")
                 payload = "[ERROR] Error searching"
             
         case "list_queue":
             try:
-                _ = API.queue()["queue"][0] # Throws an error if there's no queue available
+                queue = await spotify_call(API.queue)
+                _ = queue["queue"][0] # Throws an error if there's no queue available
                 
                 DISPLAY = "queue"
-                if UI:
-                    UI.add_log("Listing queue")
-                payload = CLIENT.get_results(API.queue(), ws_call="queue", keyword="queue")
+                log.info("Listing queue")
+                payload = CLIENT.get_results(queue, ws_call="queue", keyword="queue")
             except:
-                if UI:
-                    UI.add_log("No queue found")
+                log.info("No queue found")
                 payload = "[ERROR] No queue found"
     
     return payload
 
 # Displays tracks in an album or playlist
-def display_info(received: str, data: str) -> str:
+async def display_info(received: str, data: str) -> str:
     global DISPLAY
     payload: str = ""
     
@@ -482,16 +554,14 @@ def display_info(received: str, data: str) -> str:
             # Data format: <album uri>
             try:
                 DISPLAY = "album"
-                _ = API.album_tracks(data)["items"][0] # Throws an error if there are no tracks in the album
-            
-                album_info = API.album(data)
-                if UI:
-                    UI.add_log(f"Displaying album: {album_info['name']}")
+                album_info = await spotify_call(API.album, data)
+                _ = album_info["tracks"]["items"][0] # Throws an error if there are no tracks in the album
+                
+                log.info("Displaying album: %s", album_info['name'])
                 
                 payload = CLIENT.display_album(album_info)
             except:
-                if UI:
-                    UI.add_log("Error loading album tracks")
+                log.error("Error loading album tracks")
                 payload = "[ERROR] Error loading album tracks"
 
         case "display_playlist":
@@ -500,141 +570,217 @@ def display_info(received: str, data: str) -> str:
             spl = data.split(" ")
             try:
                 if ("collection" in spl[0]):
-                    _ = API.current_user_saved_tracks()["items"][0] # Throws an error if there are no tracks in their Liked Songs
+                    saved_tracks = await spotify_call(API.current_user_saved_tracks)
+                    _ = saved_tracks["items"][0] # Throws an error if there are no tracks in their Liked Songs
                     
-                    if UI:
-                        UI.add_log("Displaying Liked Songs")
+                    log.info("Displaying Liked Songs")
                     
-                    payload = CLIENT.display_playlist(API.current_user_saved_tracks(), offset=int(spl[1]), uri=spl[0])
+                    payload = await spotify_call(CLIENT.display_playlist, saved_tracks, offset=int(spl[1]), uri=spl[0])
                 else:
-                    playlist_info = API.playlist(playlist_id=spl[0])
+                    playlist_info = await spotify_call(API.playlist, playlist_id=spl[0])
                     _ = playlist_info["tracks"]["items"] # Throws an error if there are no tracks in the playlist
                     
-                    if UI:
-                        UI.add_log(f"Displaying playlist: {playlist_info['name']}")
+                    log.info("Displaying playlist: %s", playlist_info['name'])
                 
-                    payload = CLIENT.display_playlist(playlist_info, offset=int(spl[1]))
+                    payload = await spotify_call(CLIENT.display_playlist, playlist_info, offset=int(spl[1]))
             except:
-                if UI:
-                    UI.add_log("Error loading playlist tracks")
+                log.error("Error loading playlist tracks")
                 payload = "[ERROR] Error loading playlist tracks"
         
         case "display_artist":
             # Data format: <artist uri>
             DISPLAY = "artist"
             try:
-                artist_info = API.artist(data)
-                _ = API.artist_top_tracks(data)["tracks"][0] # Throws an error if the artist has no tracks
+                artist_info, top_tracks, albums = await aio.gather(
+                    spotify_call(API.artist, data),
+                    spotify_call(API.artist_top_tracks, data),
+                    spotify_call(API.artist_albums, data)
+                )
+                _ = top_tracks["tracks"][0] # Throws an error if the artist has no tracks
                 
-                if UI:
-                    UI.add_log(f"Displaying artist: {artist_info['name']}")
+                log.info("Displaying artist: %s", artist_info['name'])
                 
-                payload = CLIENT.display_artist(artist_info, API.artist_top_tracks(data), API.artist_albums(data))
+                payload = CLIENT.display_artist(artist_info, top_tracks, albums)
             except:
-                if UI:
-                    UI.add_log("Error loading artist")
+                log.error("Error loading artist")
                 payload = "[ERROR] Error loading artist"
     
     return payload
 
+# Returns the canvas video, artist image or track color of the currently playing track
+async def get_media_info(received: str, data: str) -> str:
+    payload: str = ""
+    
+    try:
+        track_data = await get_global_state()
+        track_id = track_data['item']['id']
+                
+        if received == "get_canvas_video":
+            canvas_data = await get_spotify_canvas(SESSION, track_id)
+            if canvas_data and canvas_data.get("canvasUrl"):
+                payload = f"CANVAS_URL:{canvas_data['canvasUrl']}"
+            else:
+                payload = "NO_CANVAS_AVAILABLE"
+                
+        elif received == "get_artist_image":
+            artist_id = track_data['item']['artists'][0]['id']
+            artist_img_url = await get_artist_image(artist_id)
+            if artist_img_url:
+                payload = f"ARTIST_IMG_URL:{artist_img_url}"
+            else:
+                payload = "NO_ARTIST_IMAGE_AVAILABLE"
+                
+        elif received == "get_track_color":
+            # Get album art URL from current track
+            if track_data['item']['album']['images']:
+                album_art_url = track_data['item']['album']['images'][0]['url']
+                # Get dominant color in hex format
+                color_hex = await aio.to_thread(spotify_color.get_dominant_color, album_art_url)
+                if color_hex:
+                    payload = f"TRACK_COLOR:{color_hex}"
+                else:
+                    payload = "NO_COLOR_AVAILABLE"
+            else:
+                payload = "NO_ALBUM_ART_AVAILABLE"
+            
+    except Exception as e:
+        log.error("Error processing media request: %s", e)
+        payload = f"[ERROR] {str(e)}"
+    
+    return payload
+
+# Maps each websocket command to the coroutine that handles it, called as handler(received, data)
+HANDLERS: dict[str, callable] = {
+    **dict.fromkeys(_CURRENT_CMDS, lambda received, data: display_current_info(received)),
+    **dict.fromkeys(_TRACK_CMDS, modify_current_track),
+    **dict.fromkeys(_STATE_CMDS, lambda received, data: modify_playback_states(received)),
+    **dict.fromkeys(_LIST_CMDS, list_stuff),
+    **dict.fromkeys(_DISPLAY_CMDS, display_info),
+    **dict.fromkeys(_MEDIA_CMDS, get_media_info),
+}
+
+# Refreshes GLOBAL_STATE once per POLL_INTERVAL, so clients polling current_info/current_states
+# don't each cost a Spotify call. When the track changes, the new track info is pushed to every client.
+# Commands can refresh GLOBAL_STATE in between, so changes are detected against the last pushed track
+async def _poll_state():
+    global GLOBAL_STATE, GLOBAL_STATE_VERSION, _PUSHED_TRACK_ID
+    
+    while True:
+        try:
+            version = _STATE_VERSION
+            state = await spotify_call(API.current_playback)
+            # A command finished during the call, so this is outdated and a reader may already have a newer one
+            if version == _STATE_VERSION:
+                GLOBAL_STATE, GLOBAL_STATE_VERSION = state, version
+            state = GLOBAL_STATE
+            new_id = state["item"]["id"] if (state and state.get("item")) else None
+            
+            if (new_id is not None) and (new_id != _PUSHED_TRACK_ID) and CLIENT_QUEUES:
+                _PUSHED_TRACK_ID = new_id
+                payload = await display_current_info("current_info")
+                for out_q in CLIENT_QUEUES:
+                    if not out_q.full(): # Skip clients that aren't keeping up, they'll get the next one
+                        out_q.put_nowait(payload)
+        except Exception:
+            pass # Keep the last snapshot if Spotify can't be reached, and try again next cycle
+        
+        await aio.sleep(POLL_INTERVAL)
+
+# Sends queued payloads to a client, so a slow send never holds up reading the next command.
+# Payloads that piled up while a send was in flight go out as one frame, split by PAYLOAD_SEPARATOR
+async def _writer(websocket: ws.WebSocketClientProtocol, out_q: aio.Queue):
+    while True:
+        msg: str = await out_q.get()
+        while not out_q.empty():
+            msg += PAYLOAD_SEPARATOR + out_q.get_nowait()
+        await websocket.send(msg)
+
+# Runs one client command and queues its response, freeing up one of the client's command slots when done.
+# Commands in _ORDERED_CMDS hold the client's order lock until their response is queued, so a pause sent
+# after a play can't overtake it and their responses come back in the order the commands were sent
+async def _run_command(received: str, data: str | None, out_q: aio.Queue, slots: aio.Semaphore, order_lock: aio.Lock):
+    try:
+        if received in _ORDERED_CMDS:
+            async with order_lock:
+                await _respond(received, data, out_q)
+        else:
+            await _respond(received, data, out_q)
+    finally:
+        slots.release()
+
+async def _respond(received: str, data: str | None, out_q: aio.Queue):
+    payload: str = ""
+    
+    handler = HANDLERS.get(received)
+    try:
+        if handler:
+            payload = await handler(received, data)
+        else:
+            log.info("Unknown command: %s", received)
+            payload = "[ERROR] Unknown command"
+    except Exception as e:
+        # Handlers catch the errors they expect, this keeps anything else from leaving the client without a reply
+        log.exception("[ERROR] Error running command %s: %s", received, e)
+        payload = f"[ERROR] {e}"
+    
+    if payload != "":
+        log.debug("Response sent: %s", payload)
+    
+    if received in _SNAPSHOT_CMDS:
+        # Playback states are a snapshot, so drop this one if the client is behind, the next poll replaces it
+        try:
+            out_q.put_nowait(payload)
+        except aio.QueueFull:
+            pass
+    else:
+        await out_q.put(payload) # Waits if the client isn't keeping up with its responses
+
 async def socket(websocket: ws.WebSocketClientProtocol):
     global DISPLAY, UI
     
     # Initializing the websocket
     ID = str(websocket.id)
+    log.info("Client %s connected!", ID[:8])
     if UI:
-        UI.add_log(f"Client {ID[:8]} connected!")
         UI.set_client_status(True, ID[:8])
     
-    await websocket.send(CLIENT.get_playback_states())
+    out_q: aio.Queue = aio.Queue(maxsize=64)
+    writer = aio.create_task(_writer(websocket, out_q))
+    CLIENT_QUEUES.add(out_q)
+    
+    slots = aio.Semaphore(MAX_PENDING_COMMANDS)
+    order_lock = aio.Lock()
+    pending: set[aio.Task] = set()
     
     try:
+        await out_q.put(await get_current_states())
+        
         async for message in websocket:
             # Message format: "command" "extra data"
-            parsed: list[str] = message.removesuffix(" ").split(" ")
-            received: str     = ""
-            data: str | None  = None
+            received, _, data = message.removesuffix(" ").partition(" ") # Only the single protocol terminator, data may end in spaces
+            data: str | None  = data or None
             
-            if (len(parsed) < 2):
-                received = message
-                if UI:
-                    UI.add_log(f"Client {ID[:8]} command: {received}")
+            if (data is None):
+                log.info("Client %s command: %s", ID[:8], received)
             else:
-                received = parsed[0]
-                data     = " ".join(parsed[1:])
-                if UI:
-                    UI.add_log(f"Client {ID[:8]} command: {received} {data[:20] + '...' if len(data) > 20 else data}")
+                log.info("Client %s command: %s %s", ID[:8], received, data[:20] + '...' if len(data) > 20 else data)
 
-            payload: str = ""
-            
-            if (received in ["current_info", "current_song", "current_states"]):
-                payload = display_current_info(received)
-                
-            elif (received in ["next", "previous", "play"]):
-                payload = modify_current_track(received, data)
-
-            elif (received in ["pause", "resume", "shuffle", "repeat"]):
-                payload = modify_playback_states(received)
-                
-            elif (received in ["list_playlists", "search", "list_queue"]):
-                payload = list_stuff(received, data)
-            
-            elif (received in ["display_album", "display_playlist", "display_artist"]):
-                payload = display_info(received, data)
-            
-            elif (received in ["get_canvas_video", "get_artist_image", "get_track_color"]):
-                try:
-                    track_data = API.current_user_playing_track()
-                    track_id = track_data['item']['id']
-                    
-                    if received == "get_canvas_video":
-                        canvas_data = get_spotify_canvas(track_id)
-                        if canvas_data and canvas_data.get("canvasUrl"):
-                            payload = f"CANVAS_URL:{canvas_data['canvasUrl']}"
-                        else:
-                            payload = "NO_CANVAS_AVAILABLE"
-                    
-                    elif received == "get_artist_image":
-                        artist_id = track_data['item']['artists'][0]['id']
-                        artist_img_url = get_artist_image(artist_id)
-                        if artist_img_url:
-                            payload = f"ARTIST_IMG_URL:{artist_img_url}"
-                        else:
-                            payload = "NO_ARTIST_IMAGE_AVAILABLE"
-                    
-                    elif received == "get_track_color":
-                        # Get album art URL from current track
-                        if track_data['item']['album']['images']:
-                            album_art_url = track_data['item']['album']['images'][0]['url']
-                            # Get dominant color in hex format
-                            color_hex = spotify_color.get_dominant_color(album_art_url)
-                            if color_hex:
-                                payload = f"TRACK_COLOR:{color_hex}"
-                            else:
-                                payload = "NO_COLOR_AVAILABLE"
-                        else:
-                            payload = "NO_ALBUM_ART_AVAILABLE"
-                
-                except Exception as e:
-                    if UI:
-                        UI.add_log(f"Error processing media request: {str(e)}")
-                    payload = f"[ERROR] {str(e)}"
-            
-            else:
-                if UI:
-                    UI.add_log(f"Unknown command: {received}")
-                payload = "[ERROR] Unknown command"
-        
-            if DEBUG and payload != "":
-                if UI:
-                    UI.add_log(f"Response sent: {payload}")
-                    
-            await websocket.send(payload)
+            # Limit how many commands a client can have in flight. While all slots are taken this stops
+            # reading, so further messages wait in the websockets receive queue (max_queue) and then TCP
+            await slots.acquire()
+            task = aio.create_task(_run_command(received, data, out_q, slots, order_lock))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
             
     except Exception as e:
+        log.error("[ERROR] Connection error with client %s: %s", ID[:8], e)
         if UI:
-            UI.add_log(f"[ERROR] Connection error with client {ID[:8]}: {str(e)}")
             UI.set_client_status(False)
+    finally:
+        CLIENT_QUEUES.discard(out_q)
+        for task in pending:
+            task.cancel()
+        writer.cancel()
 
 # Variable to store the current screen mode we're displaying
 DISPLAY: str = ""
@@ -642,38 +788,44 @@ DISPLAY: str = ""
 def curses_main(stdscr):
     global UI, API, CLIENT
     
-    # Initialize UI
-    UI = SpotipyUI(stdscr, CLIENT)
+    # Initialize UI. It shows the GLOBAL_STATE snapshot _poll_state keeps, rather than polling Spotify itself
+    UI = SpotipyUI(stdscr, CLIENT, playback_source=lambda: GLOBAL_STATE)
     
-    # Wait for user to quit
-    while True:
+    # Start showing server logs in the UI, including the ones queued up before it existed
+    listener = QueueListener(LOG_QUEUE, UILogHandler(UI))
+    listener.start()
+    
+    # Wait for user to quit. Keys are read by the UI's render thread, the only thread that touches
+    # curses, and resizes are handled there too. The timeout lets a server shutdown end this loop
+    while UI.running:
         try:
-            key = stdscr.getch()
+            key = UI.get_key(timeout=0.1)
             if key == ord('q'):  # Quit on 'q'
                 break
             elif key == ord('r'):  # Refresh on 'r'
-                stdscr.clear()
-                stdscr.refresh()
+                UI.redraw_ui(clear=True)
         except KeyboardInterrupt:
             break
     
     # Shutdown UI
+    listener.stop()
     if UI:
         UI.shutdown()
 
 async def main():
-    global API, CLIENT, UI
+    global API, CLIENT, UI, SESSION
     
     # Check for IDs.txt at startup
     check_ids_file()
     
+    log.setLevel(logging.DEBUG if DEBUG else logging.INFO)
+    
     # Create a shutdown event
     shutdown_event = aio.Event()
     
     # Define a shutdown handler
     def shutdown_signal(signal, frame):
-        if UI:
-            UI.add_log("Shutting down...")
+        log.info("Shutting down...")
         shutdown_event.set()
     
     # Register the signal handlers
@@ -685,26 +837,57 @@ async def main():
         print("Failed to connect to Spotify")
         return
         
-    # Start the UI in a separate thread
-    ui_thread = threading.Thread(target=lambda: curses.wrapper(curses_main))
-    ui_thread.daemon = True
-    ui_thread.start()
-    
-    # Start the server
-    server = await ws.serve(socket, 'localhost', PORT)
-    
-    # Wait for the shutdown event
+    # Start the UI on its own thread, it finishes once the user quits with 'q'. It runs for the whole
+    # process lifetime, so it must not take up a worker of the default pool to_thread/spotify_call share
+    ui_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ui")
+    ui_future = aio.get_running_loop().run_in_executor(ui_executor, curses.wrapper, curses_main)
+    
+    # Shared HTTP session for canvas lookups, so requests don't block the event loop and reuse
+    # pooled keep-alive connections. Canvas fetches only happen on track changes, so idle connections
+    # are kept around for a few songs instead of the default 15 seconds
+    SESSION = aiohttp.ClientSession(connector=aiohttp.TCPConnector(
+        limit=32,
+        limit_per_host=16,
+        ttl_dns_cache=300,
+        keepalive_timeout=600
+    ))
+    
+    # Start polling the playback state shared by all clients
+    poll_task = aio.create_task(_poll_state())
+    
+    # Start the server. The Resonite client is local, so per-message compression only costs CPU
+    server = await ws.serve(
+        socket, 'localhost', PORT,
+        compression=None,
+        max_size=2**20,
+        max_queue=16,
+        ping_interval=20,
+        ping_timeout=20
+    )
+    
+    # Wait for either the shutdown event or the UI closing
+    shutdown_task = aio.create_task(shutdown_event.wait())
     try:
-        await shutdown_event.wait()
+        await aio.wait({shutdown_task, ui_future}, return_when=aio.FIRST_COMPLETED)
     finally:
         # Clean shutdown
+        shutdown_task.cancel()
+        poll_task.cancel()
         server.close()
         await server.wait_closed()
+        await SESSION.close()
         
-        if UI:
-            UI.add_log("Server has been shut down.")
-            time.sleep(0.5)  # Give UI time to display the message
+        if UI and UI.running: # Already shut down if the user quit from the UI
+            log.info("Server has been shut down.")
+            await aio.sleep(0.5)  # Give UI time to display the message
             UI.shutdown()
+        
+        # Let curses restore the terminal before exiting
+        try:
+            await ui_future
+        except Exception:
+            pass
+        ui_executor.shutdown(wait=False)
 
 if __name__ == '__main__':
     import argparse as arg
@@ -714,8 +897,16 @@ if __name__ == '__main__':
     
     DEBUG = args.debug
     
+    # Use the faster libuv-based event loop when it's available (uvloop doesn't support Windows).
+    # uvloop.install() is deprecated on Python 3.12+, uvloop.run() sets up the loop itself
+    try:
+        import uvloop
+        run = uvloop.run
+    except ImportError:
+        run = aio.run
+    
     try:
-        aio.run(main())
+        run(main())
     except KeyboardInterrupt:
         # Already handled
         pass
@@ -48,9 +48,6 @@ python -m PyInstaller ^
     --exclude-module PySide2 ^
     --exclude-module PySide6 ^
     --exclude-module tkinter ^
-    --hidden-import scipy ^
-    --hidden-import sklearn ^
-    --hidden-import scipy.special.cython_special ^
     --add-data "resonite_ui.py;." ^
     --add-data "spotify_color.py;." ^
     --add-data "APIClient.py;." ^
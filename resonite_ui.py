@@ -1,6 +1,13 @@
 import curses
 import time
 import threading
+import queue
+import logging
+import re
+import unicodedata
+from collections import deque
+from functools import lru_cache
+from itertools import islice
 
 # Icons (using ASCII fallbacks instead of Nerd Fonts)
 play_icon = "▶"
@@ -26,21 +33,236 @@ COLOR_PLAYING = 18       # Green text for playing
 COLOR_PAUSED = 19        # Yellow text for paused
 COLOR_TIMESTAMP = 20     # Magenta text for timestamp
 
+# curses.color_pair(COLOR_BORDER), drawn with on every frame, and the full attributes of each
+# log tag. Filled in by init_color_pairs() because they can only be looked up once curses
+# has started
+_CP_BORDER = 0
+TAG_ATTRS = {}
+
+def init_color_pairs():
+    """Look up the color pair attributes the render path uses"""
+    global _CP_BORDER
+    _CP_BORDER = curses.color_pair(COLOR_BORDER)
+    for tag, (color, attr) in TAG_STYLE.items():
+        TAG_ATTRS[tag] = curses.color_pair(color) | attr
+
+# Log categories in priority order. Each alternative looks ahead from the start of the
+# message, so the first category that appears anywhere wins, same as an if/elif chain.
+TAG_RE = re.compile(
+    r"(?=.*?(?P<error>\[ERROR\]))"
+    r"|(?=.*?(?P<canvas>Canvas URL found))"
+    r"|(?=.*?(?P<artist>Artist image URL))"
+    r"|(?=.*?(?P<color>Track color))"
+    r"|(?=.*?(?P<navigation>Next track|Previous track))"
+    r"|(?=.*?(?P<playback>Playback|Playing|resumed|paused))"
+    r"|(?=.*?(?P<control>Shuffle|Repeat))"
+    r"|(?=.*?connected)(?=.*?(?P<connection>Client))"
+    r"|(?=.*?(?P<display>Displaying|Listing))"
+    r"|(?=.*?(?P<search>Search))",
+    re.DOTALL
+)
+
+# A log entry as LogWindow.add_log stores it, e.g. <error>[12:00:00] ...</error>
+LOG_ENTRY_RE = re.compile(r"<(\w+)>(.*)</\1>", re.DOTALL)
+
+# Color pair and extra attributes each log tag is drawn with
+TAG_STYLE = {
+    "error": (COLOR_ERROR, curses.A_BOLD),
+    "canvas": (COLOR_HIGHLIGHT, curses.A_BOLD),
+    "artist": (COLOR_ALT, curses.A_BOLD),
+    "color": (COLOR_WARNING, curses.A_BOLD),
+    "navigation": (COLOR_INFO, curses.A_BOLD),
+    "playback": (COLOR_SUCCESS, curses.A_BOLD),
+    "control": (COLOR_PLAYING, curses.A_BOLD),
+    "connection": (COLOR_WARNING, curses.A_BOLD | curses.A_UNDERLINE),
+    "display": (COLOR_PAUSED, curses.A_BOLD),
+    "search": (COLOR_HIGHLIGHT, curses.A_BOLD),
+    "normal": (COLOR_DEFAULT, 0),
+}
+
+# How far in a new log has slid at each step of its animation. The curve advances 1.8 of
+# 8 frames per step and starts fast, then slows down
+LOG_EASE = tuple((step * 1.8 / 8) ** 0.15 for step in range(5))
+
+# Row clears only use a few widths, so each one's run of spaces is built once and shared
+@lru_cache(maxsize=64)
+def blank(width):
+    """Return a string of width spaces"""
+    return " " * width
+
+# Wall-clock second and its HH:MM:SS string, shared by the clock and log timestamps
+_TIME_CACHE = [0, ""]
+
+def now_hms():
+    """Current local time as HH:MM:SS, formatted at most once per second"""
+    t = int(time.time())
+    if t != _TIME_CACHE[0]:
+        _TIME_CACHE[:] = [t, time.strftime("%H:%M:%S", time.localtime(t))]
+    return _TIME_CACHE[1]
+
+@lru_cache(maxsize=4096)
+def _seconds_to_hms(seconds):
+    """Format whole seconds as MM:SS, cached since the same few values repeat every frame"""
+    minutes, seconds = divmod(seconds, 60)
+    return f"{minutes:02d}:{seconds:02d}"
+
 def ms_to_hms(ms):
     """Convert milliseconds to MM:SS format"""
     if ms is None or ms <= 0:
         return "00:00"
-    seconds = int(ms / 1000)
-    minutes = int(seconds / 60)
-    seconds = seconds % 60
-    return f"{minutes:02d}:{seconds:02d}"
+    return _seconds_to_hms(int(ms / 1000))
 
+@lru_cache(maxsize=512)
 def truncate(text, max_length):
     """Truncate text to max_length"""
     if len(text) <= max_length:
         return text
     return text[:max_length-3] + "..."
 
+@lru_cache(maxsize=1024)
+def cell_width(ch):
+    """Number of terminal columns a character takes up"""
+    if unicodedata.combining(ch) or ch in "\u200d\ufe0f":
+        return 0
+    return 2 if unicodedata.east_asian_width(ch) in ("W", "F") else 1
+
+class ShadowBuffer:
+    """Off-screen copy of stdscr that only sends changed cells to curses"""
+    def __init__(self, stdscr):
+        self.screen = stdscr
+        self.lock = threading.Lock()
+        self.attr = 0
+        # Pads drawn over the buffer on every refresh, as name -> (pad, pnoutrefresh arguments)
+        self.overlays = {}
+        self.reset()
+
+    def __getattr__(self, name):
+        # Anything that isn't drawing (getch, keypad, getmaxyx...) goes to the real window
+        return getattr(self.screen, name)
+
+    def reset(self):
+        """Size the buffer to the terminal, with every cell blank on screen"""
+        self.height, self.width = self.screen.getmaxyx()
+        self.chars = [[" "] * self.width for _ in range(self.height)]
+        self.attrs = [[0] * self.width for _ in range(self.height)]
+        self.shown_chars = [row[:] for row in self.chars]
+        self.shown_attrs = [row[:] for row in self.attrs]
+
+    def attron(self, attr):
+        self.attr |= attr
+
+    def attroff(self, attr):
+        self.attr &= ~attr
+
+    def addstr(self, y, x, text, attr=None):
+        """Write text into the buffer, the same way stdscr.addstr(y, x, text) would"""
+        if not (0 <= y < self.height and 0 <= x < self.width):
+            raise curses.error("addstr() returned ERR")
+        if attr is None:
+            attr = self.attr
+        with self.lock:
+            chars = self.chars[y]
+            attrs = self.attrs[y]
+            width = self.width
+            # Overwriting the right half of a wide character blanks its left half
+            if chars[x] == "":
+                chars[x - 1] = " "
+            if text.isascii():
+                end = min(x + len(text), width)
+                chars[x:end] = text[:end - x]
+                attrs[x:end] = [attr] * (end - x)
+            else:
+                end = x
+                for ch in text:
+                    w = cell_width(ch)
+                    if w == 0:
+                        # Combining marks ride along with the cell before them
+                        if end > x:
+                            chars[end - 1] += ch
+                        continue
+                    if end + w > width:
+                        break
+                    chars[end] = ch
+                    attrs[end] = attr
+                    if w == 2:
+                        # Second column of a wide character holds nothing of its own
+                        chars[end + 1] = ""
+                        attrs[end + 1] = attr
+                    end += w
+            if end < width and chars[end] == "":
+                chars[end] = " "
+
+    def vline(self, y, x, ch, n, attr=None):
+        """Write n copies of a narrow character down column x, like stdscr.vline(y, x, ch, n)"""
+        if not (0 <= y < self.height and 0 <= x < self.width):
+            raise curses.error("vline() returned ERR")
+        if attr is None:
+            attr = self.attr
+        with self.lock:
+            for y in range(y, min(y + n, self.height)):
+                chars = self.chars[y]
+                # Don't leave half of a wide character behind on either side
+                if chars[x] == "":
+                    chars[x - 1] = " "
+                if x + 1 < self.width and chars[x + 1] == "":
+                    chars[x + 1] = " "
+                chars[x] = ch
+                self.attrs[y][x] = attr
+
+    def erase(self):
+        """Blank the buffer; the terminal catches up on the next refresh"""
+        with self.lock:
+            for y in range(self.height):
+                self.chars[y] = [" "] * self.width
+                self.attrs[y] = [0] * self.width
+
+    def clear(self):
+        """Blank the terminal and resize the buffer to match it"""
+        with self.lock:
+            self.screen.clear()
+            self.reset()
+
+    def refresh(self):
+        """Send only the runs of cells that changed since the last refresh"""
+        with self.lock:
+            screen = self.screen
+            width = self.width
+            for y in range(self.height):
+                chars, attrs = self.chars[y], self.attrs[y]
+                shown_chars, shown_attrs = self.shown_chars[y], self.shown_attrs[y]
+                if chars == shown_chars and attrs == shown_attrs:
+                    continue
+                x = 0
+                while x < width:
+                    if chars[x] == shown_chars[x] and attrs[x] == shown_attrs[x]:
+                        x += 1
+                        continue
+                    # Start at the left half if only the right half of a wide character changed
+                    start = x - 1 if chars[x] == "" else x
+                    attr = attrs[x]
+                    end = x + 1
+                    while end < width and attrs[end] == attr and (
+                            chars[end] == "" or chars[end] != shown_chars[end] or attrs[end] != shown_attrs[end]):
+                        end += 1
+                    try:
+                        screen.addstr(y, start, "".join(chars[start:end]), attr)
+                    except curses.error:
+                        # Writing the bottom-right cell moves the cursor off screen
+                        pass
+                    x = end
+                shown_chars[:] = chars
+                shown_attrs[:] = attrs
+            screen.noutrefresh()
+            # Pads go on after stdscr so a full stdscr copy (after a clear) can't cover them
+            for pad, args in self.overlays.values():
+                try:
+                    pad.touchwin()
+                    pad.noutrefresh(*args)
+                except curses.error:
+                    # Area doesn't fit on a terminal this small
+                    pass
+            curses.doupdate()
+
 class Component:
     """Base component class for UI elements"""
     def __init__(self, stdscr):
@@ -53,45 +275,54 @@ class Component:
         self.title = None
         self.popup = False
         self.interactive = False
+        self._border_cache = None
 
     def activate(self):
         curses.curs_set(0)
-        if hasattr(self.component, 'active'):
-            self.component.active = True
+        self.component.active = True
 
     def deactivate(self):
         curses.curs_set(1)
-        if hasattr(self.component, 'active'):
-            self.component.active = False
+        self.component.active = False
+
+    def _rebuild_border_cache(self):
+        """Precompute the border strings and edge positions for the current size"""
+        h_border = "─" * (self.endx - self.startx - 1)
+        self._border_cache = {
+            "top": "╭" + h_border + "╮",
+            "bottom": "╰" + h_border + "╯",
+            "title": f" {self.title} " if self.title else None,
+            "sides": (self.starty + 1, self.endy - self.starty - 1),
+        }
 
     def create_border(self, color):
         """Create a border around the component with the specified color"""
         try:
-            # Always use COLOR_BORDER for borders to match UI color scheme
-            self.stdscr.attron(curses.color_pair(COLOR_BORDER))
+            if self._border_cache is None:
+                self._rebuild_border_cache()
+            cache = self._border_cache
+            stdscr = self.stdscr
+            addstr = stdscr.addstr
+            startx = self.startx
 
-            # Draw all borders at once with fewer operations
-            # Corners
-            self.stdscr.addstr(self.starty, self.startx, "╭")
-            self.stdscr.addstr(self.starty, self.endx, "╮")
-            self.stdscr.addstr(self.endy, self.startx, "╰")
-            self.stdscr.addstr(self.endy, self.endx, "╯")
+            # Always use COLOR_BORDER for borders to match UI color scheme
+            stdscr.attron(_CP_BORDER)
 
-            # Horizontal borders
-            h_border = "─" * (self.endx - self.startx - 1)
-            self.stdscr.addstr(self.starty, self.startx + 1, h_border)
-            self.stdscr.addstr(self.endy, self.startx + 1, h_border)
+            # Top and bottom edges, corners included
+            addstr(self.starty, startx, cache["top"])
+            addstr(self.endy, startx, cache["bottom"])
 
-            # Vertical borders
-            for i in range(self.starty + 1, self.endy):
-                self.stdscr.addstr(i, self.startx, "│")
-                self.stdscr.addstr(i, self.endx, "│")
+            # Vertical borders, one call per side
+            side_y, side_height = cache["sides"]
+            if side_height > 0:
+                stdscr.vline(side_y, startx, "│", side_height)
+                stdscr.vline(side_y, self.endx, "│", side_height)
 
             # Title
-            if self.title:
-                self.stdscr.addstr(self.starty, self.startx + 2, f" {self.title} ")
+            if cache["title"]:
+                addstr(self.starty, startx + 2, cache["title"])
 
-            self.stdscr.attroff(curses.color_pair(COLOR_BORDER))
+            stdscr.attroff(_CP_BORDER)
         except Exception:
             # Graceful error handling for border rendering
             pass
@@ -99,6 +330,10 @@ class Component:
     def render(self, status=None):
         """Render the component and its content"""
         try:
+            # Leave the component alone if nothing about it changed since it was last drawn
+            if self.component and not self.component.update(status):
+                return
+            
             if self.popup:
                 self.clear_content_area(fill_borders=True)
                 self.create_border(COLOR_POPUP)
@@ -114,9 +349,7 @@ class Component:
         except Exception as e:
             # Add fallback rendering for component
             try:
-                self.stdscr.attron(curses.A_BOLD)
-                self.stdscr.addstr(self.starty + 1, self.startx + 1, f"Component Error: {str(e)[:30]}")
-                self.stdscr.attroff(curses.A_BOLD)
+                self.stdscr.addstr(self.starty + 1, self.startx + 1, f"Component Error: {str(e)[:30]}", curses.A_BOLD)
             except:
                 pass
 
@@ -136,9 +369,10 @@ class Component:
         if end_y >= max_y:
             end_y = max_y - 1
         
+        row = blank(width)
         for y in range(start_y, end_y):
             try:
-                self.stdscr.addstr(y, start_x, " " * width)
+                self.stdscr.addstr(y, start_x, row)
             except:
                 # Gracefully handle any rendering issues
                 pass
@@ -152,12 +386,21 @@ class BaseComponentContent:
         self.endy = endy
         self.endx = endx
         self.active = False
+        # Every inner component has this, so the UI loops can read it without checking first
+        self.animation_active = False
+        # Signature of the state last drawn, so an unchanged frame can be skipped
+        self._state_sig = None
         
     def clear_content_area(self):
         """Clear the component's content area"""
+        row = blank(self.endx - self.startx - 1)
         for y in range(self.starty + 1, self.endy):
-            self.stdscr.addstr(y, self.startx + 1, " " * (self.endx - self.startx - 1))
+            self.stdscr.addstr(y, self.startx + 1, row)
             
+    def update(self, status=None):
+        """Take in new state; returns True if the component needs redrawing"""
+        return True
+    
     def render(self, status=None):
         """Base render method to be overridden by child classes"""
         self.clear_content_area()
@@ -172,9 +415,17 @@ class NowPlayingComponent(BaseComponentContent):
         self.track_length = 0
         self.progress = 0
         self.progress_percent = 0
+        self.shuffle = False
+        self.repeat = "off"
         # Progress bar characters
         self.filled_block = "▰"
         self.empty_block = "▱"
+        # Every possible bar for the current bar width, indexed by filled block count
+        self._bar_cache = None
+        self._bar_cache_width = 0
+        # Truncated track text and progress bar geometry, and what they were worked out for
+        self._layout = None
+        self._layout_key = None
         # Animation state
         self.previous_track_name = None
         self.previous_artist_name = None
@@ -182,6 +433,9 @@ class NowPlayingComponent(BaseComponentContent):
         self.animation_frame = 0
         self.animation_max_frames = 20
         self.animation_complete = False
+        # Carousel positions for every frame, and the texts and width they were built for
+        self._anim_table = None
+        self._anim_key = None
         # Timer for blank display
         self.no_track_start_time = time.time()
         self.blank_display_seconds = 10
@@ -192,60 +446,37 @@ class NowPlayingComponent(BaseComponentContent):
         self.animation_frame = 0
         self.animation_complete = False
 
-    def animate_text(self, y, text, max_width):
-        """Animate sliding text based on current animation frame with carousel effect"""
-        if not self.animation_active or self.animation_complete:
-            # Just render the text normally if animation is not active
-            truncated_text = truncate(text, max_width)
-            
-            # Center the text more precisely
-            text_length = len(truncated_text)
-            padding = (max_width - text_length) // 2
-            padding = max(0, padding)  # Ensure padding is non-negative
-            
-            # Add padding before text for centering
-            self.stdscr.addstr(y, self.startx + 1 + padding, truncated_text)
-            return
-        
-        # For carousel animation, we'll keep the entire text together including icons
-        content_area_start = self.startx + 1
+    def build_carousel(self, old_text, new_text, content_area_start, max_width):
+        """Precompute the (x, visible text) of the old and new text for every animation frame"""
         content_area_end = content_area_start + max_width
         
         # Calculate center position
         center_pos = content_area_start + (max_width // 2)
         
-        if self.previous_track_name and self.animation_frame < self.animation_max_frames:
-            # Truncate both texts to fit
-            old_text = truncate(self.previous_track_name, max_width)
-            new_text = truncate(text, max_width)
-            
+        # CAROUSEL EFFECT:
+        # 1. Old text moves from center to left (exiting)
+        # 2. New text moves from right to center (entering)
+        
+        # Old text: calculate position to move from center to left
+        old_text_width = len(old_text)
+        # Ensure old text starts perfectly centered
+        old_start_x = center_pos - (old_text_width // 2)  # Centered position
+        old_end_x = content_area_start - old_text_width    # Fully left (offscreen)
+        
+        # New text: calculate position to move from right to center
+        new_text_width = len(new_text)
+        new_start_x = content_area_end  # Start from right edge
+        # Ensure new text ends perfectly centered
+        new_end_x = center_pos - (new_text_width // 2)  # End at center
+        
+        table = []
+        for frame in range(self.animation_max_frames):
             # Animation progress factor (0 to 1)
-            progress = self.animation_frame / self.animation_max_frames
-            
-            # Clear the content area first
-            for i in range(max_width):
-                self.stdscr.addstr(y, content_area_start + i, " ")
-            
-            # CAROUSEL EFFECT:
-            # 1. Old text moves from center to left (exiting)
-            # 2. New text moves from right to center (entering)
-            
-            # Old text: calculate position to move from center to left
-            old_text_width = len(old_text)
-            # Ensure old text starts perfectly centered
-            old_start_x = center_pos - (old_text_width // 2)  # Centered position
-            old_end_x = content_area_start - old_text_width    # Fully left (offscreen)
+            progress = frame / self.animation_max_frames
+            old_draw = new_draw = None
             
             # Linear interpolation between start and end positions
             old_current_x = int(old_start_x + progress * (old_end_x - old_start_x))
-            
-            # New text: calculate position to move from right to center
-            new_text_width = len(new_text)
-            new_start_x = content_area_end  # Start from right edge
-            # Ensure new text ends perfectly centered
-            new_end_x = center_pos - (new_text_width // 2)  # End at center
-            
-            # Linear interpolation between start and end positions
             new_current_x = int(new_start_x + progress * (new_end_x - new_start_x))
             
             # Only draw old text if it's still visible
@@ -260,18 +491,60 @@ class NowPlayingComponent(BaseComponentContent):
                         text_start_idx = content_area_start - old_current_x
                         draw_x = content_area_start
                     
-                    # Draw visible portion of old text
+                    # Visible portion of old text
                     visible_text = old_text[text_start_idx:text_start_idx + visible_portion]
                     if visible_text:
-                        self.stdscr.addstr(y, draw_x, visible_text)
+                        old_draw = (draw_x, visible_text)
             
             # Only draw new text if it's starting to be visible
             if new_current_x < content_area_end:
                 visible_portion = min(new_text_width, content_area_end - new_current_x)
                 if visible_portion > 0 and new_current_x >= content_area_start:
-                    # Draw visible portion of new text
-                    visible_text = new_text[:visible_portion]
-                    self.stdscr.addstr(y, new_current_x, visible_text)
+                    # Visible portion of new text
+                    new_draw = (new_current_x, new_text[:visible_portion])
+            
+            table.append((old_draw, new_draw))
+        return table
+
+    def animate_text(self, y, text, max_width):
+        """Animate sliding text based on current animation frame with carousel effect"""
+        if not self.animation_active or self.animation_complete:
+            # Just render the text normally if animation is not active
+            truncated_text = truncate(text, max_width)
+            
+            # Center the text more precisely
+            text_length = len(truncated_text)
+            padding = (max_width - text_length) // 2
+            padding = max(0, padding)  # Ensure padding is non-negative
+            
+            # Add padding before text for centering
+            self.stdscr.addstr(y, self.startx + 1 + padding, truncated_text)
+            return
+        
+        # For carousel animation, we'll keep the entire text together including icons
+        content_area_start = self.startx + 1
+        
+        if self.previous_track_name and self.animation_frame < self.animation_max_frames:
+            # Truncate both texts to fit
+            old_text = truncate(self.previous_track_name, max_width)
+            new_text = truncate(text, max_width)
+            
+            # Where each text sits on every frame is worked out once per track change
+            key = (old_text, new_text, content_area_start, max_width)
+            if self._anim_key != key:
+                self._anim_table = self.build_carousel(old_text, new_text, content_area_start, max_width)
+                self._anim_key = key
+            old_draw, new_draw = self._anim_table[self.animation_frame]
+            
+            # Clear the content area first
+            addstr = self.stdscr.addstr
+            addstr(y, content_area_start, blank(max_width))
+            
+            # Draw whatever is visible of the old and new text this frame
+            if old_draw:
+                addstr(y, old_draw[0], old_draw[1])
+            if new_draw:
+                addstr(y, new_draw[0], new_draw[1])
             
             # Update animation frame
             self.animation_frame += 1
@@ -290,46 +563,60 @@ class NowPlayingComponent(BaseComponentContent):
             self.stdscr.addstr(y, content_area_start + center_padding, truncated_content)
             self.animation_complete = True
 
+    def update(self, status):
+        """Update track information from status; returns True if it needs redrawing"""
+        if status:
+            self.playing = status.get("is_playing", False)
+            item = status.get("item", None)
+            if item:
+                # Check if track has changed
+                new_track_name = item.get("name", "-")
+                artists = item.get("artists", [])
+                new_artist_name = artists[0].get("name", "-") if artists else "-"
+                
+                # Start animation if track changed
+                if new_track_name != self.track_name:
+                    self.previous_track_name = self.track_name
+                    self.previous_artist_name = self.artist_name
+                    self.start_animation()
+                
+                self.track_name = new_track_name
+                self.artist_name = new_artist_name
+                self.track_length = item.get("duration_ms", 0)
+                self.progress = status.get("progress_ms", 0)
+                self.progress_percent = ((self.progress / self.track_length) * 100 
+                                        if self.progress > 0 and self.track_length > 0 else 0)
+                # Reset no-track timer when we have a track
+                self.no_track_start_time = time.time()
+            else:
+                # No track in status, check if we need to reset the timer
+                if self.track_name != "-":
+                    self.no_track_start_time = time.time()
+                    self.track_name = "-"
+                    self.artist_name = "-"
+        
+        # Get playback state
+        self.shuffle = status.get("shuffle_state", False) if status else False
+        self.repeat = status.get("repeat_state", "off") if status else "off"
+        
+        # Nothing to redraw if the same second of the same track is already on screen
+        content_width = self.endx - self.startx - 1
+        waiting = self.track_name == "-" and time.time() - self.no_track_start_time >= self.blank_display_seconds
+        sig = (self.playing, self.track_name, self.artist_name, self.progress // 1000, self.track_length,
+               self.shuffle, self.repeat, self.animation_active, content_width, waiting)
+        if sig == self._state_sig and not self.animation_active:
+            return False
+        self._state_sig = sig
+        return True
+
     def render(self, status):
         """Render the currently playing track information"""
         try:
             # Clear the content area
             super().render()
             
-            # Update track information if status is available
-            if status:
-                self.playing = status.get("is_playing", False)
-                item = status.get("item", None)
-                if item:
-                    # Check if track has changed
-                    new_track_name = item.get("name", "-")
-                    artists = item.get("artists", [])
-                    new_artist_name = artists[0].get("name", "-") if artists else "-"
-                    
-                    # Start animation if track changed
-                    if new_track_name != self.track_name:
-                        self.previous_track_name = self.track_name
-                        self.previous_artist_name = self.artist_name
-                        self.start_animation()
-                    
-                    self.track_name = new_track_name
-                    self.artist_name = new_artist_name
-                    self.track_length = item.get("duration_ms", 0)
-                    self.progress = status.get("progress_ms", 0)
-                    self.progress_percent = ((self.progress / self.track_length) * 100 
-                                            if self.progress > 0 and self.track_length > 0 else 0)
-                    # Reset no-track timer when we have a track
-                    self.no_track_start_time = time.time()
-                else:
-                    # No track in status, check if we need to reset the timer
-                    if self.track_name != "-":
-                        self.no_track_start_time = time.time()
-                        self.track_name = "-"
-                        self.artist_name = "-"
-            
-            # Get playback state icons
-            shuffle = status.get("shuffle_state", False) if status else False
-            repeat = status.get("repeat_state", "off") if status else "off"
+            shuffle = self.shuffle
+            repeat = self.repeat
             
             # For animation purposes, always include the playback status in the display text
             # instead of handling it separately
@@ -360,6 +647,9 @@ class NowPlayingComponent(BaseComponentContent):
             else:
                 full_track_info = f"{status_symbol}{shuffle_symbol}{repeat_symbol} {self.track_name} - {self.artist_name}"
             
+            # Determine total available width in the content area
+            content_width = self.endx - self.startx - 1
+            
             # Set the old track info with the appropriate icon too if we're in an animation
             if self.animation_active and self.previous_track_name and not self.animation_complete:
                 if self.previous_track_name == "-":
@@ -374,45 +664,55 @@ class NowPlayingComponent(BaseComponentContent):
                     if not any(icon in self.previous_track_name for icon in [play_icon, pause_icon]):
                         self.previous_track_name = f"{status_symbol}{shuffle_symbol}{repeat_symbol} {self.previous_track_name} - {self.previous_artist_name}"
             
-            # Determine total available width in the content area
-            content_width = self.endx - self.startx - 1
-            
-            # Calculate minimum space needed for the progress bar
-            min_progress_width = len(current_time) + len(total_time) + 6  # +6 for at least 4 blocks and spaces
-            
-            # Calculate maximum possible track info length
-            max_possible_track_width = content_width - min_progress_width - 2  # -2 for spacing
-            
-            # If track info is shorter than the max possible, use its actual length
-            # Otherwise, truncate it to fit
-            if len(full_track_info) <= max_possible_track_width:
-                track_info = full_track_info
-                # Calculate remaining space for progress bar (all the rest minus spacing)
-                progress_bar_width = content_width - len(track_info) - 2
-            else:
-                # Need to truncate track info
-                track_info = truncate(full_track_info, max_possible_track_width)
-                progress_bar_width = min_progress_width
-            
-            # Ensure we have enough space for both components
-            if content_width < (min_progress_width + 15):  # Not enough space for both
-                # Prioritize track info with minimum length of 15
-                track_info = truncate(full_track_info, 15)
+            # The layout only changes with the width, the time lengths and the text itself,
+            # so the per-second progress updates reuse it
+            layout_key = (content_width, len(current_time), len(total_time), full_track_info)
+            if layout_key != self._layout_key:
+                # Calculate minimum space needed for the progress bar
+                min_progress_width = len(current_time) + len(total_time) + 6  # +6 for at least 4 blocks and spaces
                 
-                # If we still have space for a minimal progress indicator, show it
-                if content_width > len(track_info) + min_progress_width:
+                # Calculate maximum possible track info length
+                max_possible_track_width = content_width - min_progress_width - 2  # -2 for spacing
+                
+                # If track info is shorter than the max possible, use its actual length
+                # Otherwise, truncate it to fit
+                if len(full_track_info) <= max_possible_track_width:
+                    track_info = full_track_info
+                    # Calculate remaining space for progress bar (all the rest minus spacing)
                     progress_bar_width = content_width - len(track_info) - 2
                 else:
-                    # Fall back to simple timestamp at the right edge
-                    progress_bar_width = len(current_time) + 2
+                    # Need to truncate track info
+                    track_info = truncate(full_track_info, max_possible_track_width)
+                    progress_bar_width = min_progress_width
+                
+                # Ensure we have enough space for both components
+                if content_width < (min_progress_width + 15):  # Not enough space for both
+                    # Prioritize track info with minimum length of 15
+                    track_info = truncate(full_track_info, 15)
+                    
+                    # If we still have space for a minimal progress indicator, show it
+                    if content_width > len(track_info) + min_progress_width:
+                        progress_bar_width = content_width - len(track_info) - 2
+                    else:
+                        # Fall back to simple timestamp at the right edge
+                        progress_bar_width = len(current_time) + 2
+                
+                # Blocks in the full progress bar, centered in the content area
+                blocks_width = min(progress_bar_width - len(current_time) - len(total_time) - 2, 50)
+                total_width = len(current_time) + 1 + blocks_width + 1 + len(total_time)
+                progress_start = self.startx + 1 + max((content_width - total_width) // 2, 1)
+                
+                self._layout = (track_info, progress_bar_width, min_progress_width, blocks_width, progress_start)
+                self._layout_key = layout_key
+            track_info, progress_bar_width, min_progress_width, blocks_width, progress_start = self._layout
             
             # Use the border color instead of playback state color for matching UI colors
             # COLOR_BORDER = 17 is the border color that changes with keybindings 1-7
-            self.stdscr.attron(curses.color_pair(COLOR_BORDER))
+            # Everything below is drawn in it, so switch it on once for the whole component
+            self.stdscr.attron(_CP_BORDER)
             
             # Use the animate_text method instead of direct rendering
             self.animate_text(self.starty + 1, track_info, content_width)
-            self.stdscr.attroff(curses.color_pair(COLOR_BORDER))
             
             # Progress bar/time
             if progress_bar_width > min_progress_width:
@@ -424,61 +724,32 @@ class NowPlayingComponent(BaseComponentContent):
                     # Center the time info
                     time_padding = (content_width - len(time_info)) // 2
                     time_padding = max(0, time_padding)
-                    self.stdscr.attron(curses.color_pair(COLOR_BORDER))
                     self.stdscr.addstr(progress_y, self.startx + 1 + time_padding, time_info)
-                    self.stdscr.attroff(curses.color_pair(COLOR_BORDER))
                 else:
                     # Calculate how many blocks to display for progress
-                    blocks_width = progress_bar_width - len(current_time) - len(total_time) - 2
-                    
-                    # Reduce blocks width to make progress bar shorter (approximately half the previous length)
-                    max_blocks = min(blocks_width, 50)  # Limit maximum blocks to 50
-                    blocks_width = max_blocks
-                    
                     filled_blocks = int((self.progress_percent / 100) * blocks_width)
-                    empty_blocks = blocks_width - filled_blocks
+                    if self._bar_cache is None or self._bar_cache_width != blocks_width:
+                        self._bar_cache = [self.filled_block * i + self.empty_block * (blocks_width - i)
+                                           for i in range(blocks_width + 1)]
+                        self._bar_cache_width = blocks_width
 
-                    # Calculate padding to center the progress bar
-                    total_width = len(current_time) + 1 + blocks_width + 1 + len(total_time)
-                    available_width = self.endx - self.startx - 1
-                    left_padding = (available_width - total_width) // 2
-                    
-                    # Ensure we have at least some padding
-                    left_padding = max(left_padding, 1)
-
-                    # Render full progress with bar and centered positioning
-                    progress_start = self.startx + 1 + left_padding
-                    
-                    # Current time - use border color to match UI
-                    self.stdscr.attron(curses.color_pair(COLOR_BORDER))
-                    self.stdscr.addstr(progress_y, progress_start, current_time)
-                    self.stdscr.attroff(curses.color_pair(COLOR_BORDER))
-
-                    # Progress bar - use border color to match UI
-                    self.stdscr.attron(curses.color_pair(COLOR_BORDER))
-                    progress_bar_start = progress_start + len(current_time) + 1
-                    progress_bar = self.filled_block * filled_blocks + self.empty_block * empty_blocks
-                    self.stdscr.addstr(progress_y, progress_bar_start, progress_bar)
-                    self.stdscr.attroff(curses.color_pair(COLOR_BORDER))
-
-                    # Total time - use border color to match UI
-                    self.stdscr.attron(curses.color_pair(COLOR_BORDER))
-                    self.stdscr.addstr(progress_y, progress_bar_start + blocks_width + 1, total_time)
-                    self.stdscr.attroff(curses.color_pair(COLOR_BORDER))
+                    # Current time, bar and total time in one write. This row is the bottom
+                    # border, so the gaps between them keep the border line
+                    progress_bar = self._bar_cache[min(max(filled_blocks, 0), blocks_width)]
+                    self.stdscr.addstr(progress_y, progress_start, current_time + "─" + progress_bar + "─" + total_time)
             else:
                 # Only show current time if very limited space
-                self.stdscr.attron(curses.color_pair(COLOR_BORDER))
                 # Center the time
                 time_padding = (content_width - len(current_time)) // 2
                 time_padding = max(0, time_padding)
                 self.stdscr.addstr(self.starty + 2, self.startx + 1 + time_padding, current_time)
-                self.stdscr.attroff(curses.color_pair(COLOR_BORDER))
+            
+            self.stdscr.attroff(_CP_BORDER)
         except Exception as e:
             try:
                 # Display a friendly error message
-                self.stdscr.attron(curses.color_pair(COLOR_ERROR))
-                self.stdscr.addstr(self.starty + 1, self.startx + 1, "Display error")
-                self.stdscr.attroff(curses.color_pair(COLOR_ERROR))
+                self.stdscr.attroff(_CP_BORDER)
+                self.stdscr.addstr(self.starty + 1, self.startx + 1, "Display error", curses.color_pair(COLOR_ERROR))
             except:
                 pass
 
@@ -497,6 +768,7 @@ class StatusBar(Component):
         self.endx = scrx - 1
         self.starty = 0
         self.endy = 2
+        self._rebuild_border_cache()
         self.component = StatusBarComponent(
             self.stdscr,
             self.starty,
@@ -511,7 +783,7 @@ class StatusBar(Component):
         """Update client connection status"""
         self.client_connected = connected
         self.client_id = client_id
-        if hasattr(self, 'component') and self.component:
+        if self.component is not None:
             self.component.client_connected = connected
             self.component.client_id = client_id
 
@@ -525,59 +797,70 @@ class StatusBarComponent:
         self.endx = endx
         self.client_connected = client_connected
         self.client_id = client_id
+        self.active = False
+        self.animation_active = False  # The status bar never animates
+        self.time_str = ""
+        self._state_sig = None
+        # (x, text, attributes) of the connection status, and the state it was formatted for
+        self._center_cache = None
+        self._center_cache_key = None
+    
+    def update(self, status=None):
+        """Returns True if the connection status or clock changed since the last draw"""
+        self.time_str = now_hms()
+        sig = (self.client_connected, self.client_id, self.time_str)
+        if sig == self._state_sig:
+            return False
+        self._state_sig = sig
+        return True
         
     def render(self, status=None):
         """Render the status bar content"""
         # Clear status bar area
-        for i in range(self.startx + 1, self.endx):
-            self.stdscr.addstr(self.starty + 1, i, " ")
+        self.stdscr.addstr(self.starty + 1, self.startx + 1, blank(self.endx - self.startx - 1))
         
-        # Draw left side status: app name
+        # Draw left side status: app name. Each piece passes its attributes to addstr
+        # instead of switching them on and off around it
         status_text = "Resonite Spotipy"
-        self.stdscr.attron(curses.A_BOLD)
-        self.stdscr.attron(curses.color_pair(COLOR_BORDER))
-        self.stdscr.addstr(self.starty + 1, self.startx + 1, status_text)
-        self.stdscr.attroff(curses.color_pair(COLOR_BORDER))
-        self.stdscr.attroff(curses.A_BOLD)
+        self.stdscr.addstr(self.starty + 1, self.startx + 1, status_text, _CP_BORDER | curses.A_BOLD)
         
-        # Draw center status: connection status
-        center_x = (self.endx - self.startx) // 2
-        
-        # Create status text with appropriate indicator
-        if self.client_connected:
-            status_indicator = "● CONNECTED"
-            center_text = f"Client {self.client_id}: {status_indicator}"
-            # Use green for connected
-            self.stdscr.attron(curses.color_pair(COLOR_SUCCESS))
-            self.stdscr.attron(curses.A_BOLD)
-            self.stdscr.addstr(self.starty + 1, center_x - len(center_text) // 2, center_text)
-            self.stdscr.attroff(curses.A_BOLD)
-            self.stdscr.attroff(curses.color_pair(COLOR_SUCCESS))
-        else:
-            status_indicator = "○ DISCONNECTED"
-            center_text = f"Websocket: {status_indicator}"
-            # Use red for disconnected
-            self.stdscr.attron(curses.color_pair(COLOR_ERROR))
-            self.stdscr.attron(curses.A_DIM)
-            self.stdscr.addstr(self.starty + 1, center_x - len(center_text) // 2, center_text)
-            self.stdscr.attroff(curses.A_DIM)
-            self.stdscr.attroff(curses.color_pair(COLOR_ERROR))
+        # Draw center status: connection status, only formatted again when it changes
+        center_key = (self.client_connected, self.client_id, self.endx - self.startx)
+        if center_key != self._center_cache_key:
+            center_x = (self.endx - self.startx) // 2
+            
+            # Create status text with appropriate indicator
+            if self.client_connected:
+                status_indicator = "● CONNECTED"
+                center_text = f"Client {self.client_id}: {status_indicator}"
+                # Use green for connected
+                center_attr = curses.color_pair(COLOR_SUCCESS) | curses.A_BOLD
+            else:
+                status_indicator = "○ DISCONNECTED"
+                center_text = f"Websocket: {status_indicator}"
+                # Use red for disconnected
+                center_attr = curses.color_pair(COLOR_ERROR) | curses.A_DIM
+            self._center_cache = (center_x - len(center_text) // 2, center_text, center_attr)
+            self._center_cache_key = center_key
+        center_start, center_text, center_attr = self._center_cache
+        self.stdscr.addstr(self.starty + 1, center_start, center_text, center_attr)
         
         # Draw right side information (current time)
-        time_str = time.strftime("%H:%M:%S")
-        self.stdscr.attron(curses.color_pair(COLOR_BORDER))
-        self.stdscr.addstr(self.starty + 1, self.endx - len(time_str) - 1, time_str)
-        self.stdscr.attroff(curses.color_pair(COLOR_BORDER))
+        time_str = self.time_str
+        self.stdscr.addstr(self.starty + 1, self.endx - len(time_str) - 1, time_str, _CP_BORDER)
 
 class LogWindow(Component):
     """Component for displaying log messages"""
     def __init__(self, stdscr):
         super().__init__(stdscr)
         self.title = "Log"
-        self.logs = []
         self.max_logs = 100  # Maximum number of log entries to keep
+        self.logs = deque(maxlen=self.max_logs)
+        self._log_append = self.logs.append
+        self.log_count = 0  # Logs ever added, so an entry keeps its number after older ones drop off
+        self._dirty = threading.Event()  # Set when there are logs the UI loop hasn't drawn yet
+        self.log_lock = threading.Lock()  # Keeps logs and log_count in step for the render thread
         self.restart()
-        self.new_log_indexes = set()  # Track newly added logs
         
     def restart(self):
         scry, scrx = self.stdscr.getmaxyx()
@@ -585,65 +868,51 @@ class LogWindow(Component):
         self.endx = scrx - 1
         self.starty = 3  # Start below the status bar
         self.endy = scry - 5  # Leave room for now playing component
-        self.component = LogWindowComponent(
-            self.stdscr,
-            self.starty,
-            self.startx,
-            self.endy,
-            self.endx,
-            self.logs
-        )
+        self._rebuild_border_cache()
+        # Swapped under log_lock, so a log added from another thread during a resize can't
+        # land on the component being replaced
+        with self.log_lock:
+            self.component = LogWindowComponent(
+                self.stdscr,
+                self.starty,
+                self.startx,
+                self.endy,
+                self.endx,
+                self.logs,
+                self.log_count,
+                self.log_lock
+            )
     
     def add_log(self, message):
         """Add a new log message"""
-        timestamp = time.strftime("%H:%M:%S")
-        log_entry = f"[{timestamp}] {message}"
-        
         # Enhanced log tagging with more specific categories for better coloring
-        if "[ERROR]" in message:
-            log_entry = f"<error>{log_entry}</error>"
-        elif "Canvas URL found" in message:
-            log_entry = f"<canvas>{log_entry}</canvas>"
-        elif "Artist image URL" in message:
-            log_entry = f"<artist>{log_entry}</artist>"
-        elif "Track color" in message:
-            log_entry = f"<color>{log_entry}</color>"
-        elif any(term in message for term in ["Next track", "Previous track"]):
-            log_entry = f"<navigation>{log_entry}</navigation>"
-        elif any(term in message for term in ["Playback", "Playing", "resumed", "paused"]):
-            log_entry = f"<playback>{log_entry}</playback>"
-        elif any(term in message for term in ["Shuffle", "Repeat"]):
-            log_entry = f"<control>{log_entry}</control>"
-        elif "Client" in message and "connected" in message:
-            log_entry = f"<connection>{log_entry}</connection>"
-        elif any(term in message for term in ["Displaying", "Listing"]):
-            log_entry = f"<display>{log_entry}</display>"
-        elif any(term in message for term in ["Searching", "Search"]):
-            log_entry = f"<search>{log_entry}</search>"
-        else:
-            log_entry = f"<normal>{log_entry}</normal>"
-            
-        self.logs.append(log_entry)
-        # Remember the index of the new log
-        self.new_log_indexes.add(len(self.logs) - 1)
+        match = TAG_RE.match(message)
+        tag = match.lastgroup if match else "normal"
         
-        if len(self.logs) > self.max_logs:
-            self.logs.pop(0)  # Remove oldest log entry
-            # Adjust indexes when removing old logs
-            self.new_log_indexes = {idx - 1 for idx in self.new_log_indexes if idx > 0}
+        # Tagged, timestamped entry built in one go, e.g. <error>[12:00:00] ...</error>
+        log_entry = "".join(("<", tag, ">[", now_hms(), "] ", message, "</", tag, ">"))
+            
+        # The deque drops the oldest entry by itself once max_logs is reached
+        with self.log_lock:
+            self._log_append(log_entry)
+            self.log_count += 1
+            
+            # Number of this entry, read under the lock so a log from another thread can't take it
+            number = self.log_count - 1
             
-        if hasattr(self, 'component') and self.component:
-            self.component.logs = self.logs
-            # Mark new logs for animation
-            for idx in self.new_log_indexes:
-                self.component.add_log_for_animation(idx)
-            # Force the UI to update immediately to show the animation
-            self.render(None)
-            self.new_log_indexes.clear()
+            if self.component is not None:
+                self.component.logs = self.logs
+                self.component.log_count = self.log_count
+                # Mark the new log for animation, in the same order the numbers were handed out
+                self.component.add_log_for_animation(number)
+            
+        if self.component is not None:
+            # Let the UI loop draw it on its next frame, along with anything else logged meanwhile
+            self._dirty.set()
 
 class LogWindowComponent:
     """Inner component for displaying logs"""
-    def __init__(self, stdscr, starty, startx, endy, endx, logs):
+    def __init__(self, stdscr, starty, startx, endy, endx, logs, log_count=0, log_lock=None):
         self.stdscr = stdscr
         self.starty = starty
         self.startx = startx
@@ -651,141 +920,144 @@ class LogWindowComponent:
         self.endx = endx
         self.active = False
         self.logs = logs
+        self.log_count = log_count
+        self.log_lock = log_lock or threading.Lock()
         self.scroll_offset = 0
         # Animation state
-        self.animated_logs = {}  # Maps log index to animation frame
-        self.animation_frames = 8  # Reduce frames for faster animation
+        self.animated_logs = deque()  # [log number, animation step] of each sliding log, oldest first
+        self.animation_frames = len(LOG_EASE)  # Steps before a new log is fully in place
         self.animation_active = False  # Whether any log is currently animating
+        self._state_sig = None
+        # Pad with one row per kept log, in the same order as self.logs. Each log is written
+        # to it once and curses copies the visible rows into the window on refresh. It's
+        # twice as wide as the window so wide characters never wrap onto the next row.
+        content_width = max(1, self.endx - self.startx - 1)
+        self.pad = curses.newpad((logs.maxlen or 100) + 1, content_width * 2)
+        self.pad_first = 0  # Number of the log on the pad's first row
+        self.pad_count = 0  # Number of logs written to the pad so far
+        # Log number -> (truncated text, style). Entries never change once added, so each is
+        # parsed once; the component is rebuilt on resize, which drops the old widths
+        self._parsed = {}
     
     def add_log_for_animation(self, log_index):
         """Mark a log for animation"""
-        self.animated_logs[log_index] = 0
+        self.animated_logs.append([log_index, 0])
         self.animation_active = True
     
+    def update(self, status=None):
+        """Returns True if there are new logs, a scroll or an animation to draw"""
+        sig = (len(self.logs), self.logs[-1] if self.logs else None, self.scroll_offset, self.animation_active)
+        if sig == self._state_sig and not self.animation_active:
+            return False
+        self._state_sig = sig
+        return True
+    
+    def log_style(self, log):
+        """Split a tagged log entry into its text and curses attributes"""
+        # Determine text content and color based on log tag
+        match = LOG_ENTRY_RE.match(log)
+        if match and match.group(1) in TAG_ATTRS:
+            return match.group(2), TAG_ATTRS[match.group(1)]
+        # Fallback for any logs without tags
+        return log, TAG_ATTRS["normal"]
+    
+    def parsed_log(self, number, log, max_width):
+        """Truncated text and style of a log, worked out the first time it's drawn"""
+        parsed = self._parsed.get(number)
+        if parsed is None:
+            text, style = self.log_style(log)
+            parsed = self._parsed[number] = (truncate(text, max_width), style)
+        return parsed
+    
+    def _write_row(self, row, text, style, offset=0):
+        """Replace one pad row with text, leaving out its first offset characters"""
+        self.pad.move(row, 0)
+        self.pad.clrtoeol()
+        if offset < len(text):
+            self.pad.addstr(row, 0, text[offset:], style)
+    
     def render(self, status=None):
         """Render the log messages"""
-        # Clear log area
-        for y in range(self.starty + 1, self.endy):
-            self.stdscr.addstr(y, self.startx + 1, " " * (self.endx - self.startx - 1))
+        with self.log_lock:
+            log_count = self.log_count
+            kept = len(self.logs)
+            # Only the logs that aren't on the pad yet are copied out; the rest are already
+            # parsed and drawn
+            new_from = max(self.pad_count, log_count - kept)
+            new_logs = list(islice(self.logs, kept - (log_count - new_from), None))
+        oldest = log_count - kept  # Number of the oldest log still kept
+        max_width = self.endx - self.startx - 2
+        
+        # Shift the pad up past logs that dropped out of the buffer, then write the new ones
+        if oldest > self.pad_first:
+            self.pad.move(0, 0)
+            self.pad.insdelln(-min(oldest - self.pad_first, kept + 1))
+            for number in range(self.pad_first, oldest):
+                self._parsed.pop(number, None)
+            self.pad_first = oldest
+        for number, log in enumerate(new_logs, new_from):
+            text, style = self.parsed_log(number, log, max_width)
+            self._write_row(number - oldest, text, style)
+        self.pad_count = log_count
         
         # Calculate available lines
         available_lines = self.endy - self.starty - 1
         
         # Get logs to display
-        display_logs = self.logs[-available_lines-self.scroll_offset:] if len(self.logs) > available_lines else self.logs
-        
-        # Track whether we have any active animations
-        has_active_animations = False
+        first = max(0, kept - available_lines - self.scroll_offset)
         
-        # Display logs
-        for i, log in enumerate(display_logs):
-            if i < available_lines:
-                y = self.starty + 1 + i
-                max_width = self.endx - self.startx - 2
-                
-                # Calculate the actual index in the logs list
-                log_index = len(self.logs) - len(display_logs) + i
-                
-                # Calculate animation state for this log
-                animation_progress = 0
-                is_animating = False
-                
-                if log_index in self.animated_logs:
-                    animation_frame = self.animated_logs[log_index]
-                    if animation_frame < self.animation_frames:
-                        is_animating = True
-                        has_active_animations = True
-                        # Use an accelerated animation curve to start fast and slow down
-                        animation_progress = (animation_frame / self.animation_frames) ** 0.15
-                        self.animated_logs[log_index] += 1.8
-                
-                # Determine text content and color based on log tag
-                log_color = curses.color_pair(COLOR_DEFAULT)
-                attr = 0
-                
-                if "<error>" in log:
-                    text = log.replace("<error>", "").replace("</error>", "")
-                    log_color = curses.color_pair(COLOR_ERROR)
-                    attr = curses.A_BOLD
-                elif "<canvas>" in log:
-                    text = log.replace("<canvas>", "").replace("</canvas>", "")
-                    log_color = curses.color_pair(COLOR_HIGHLIGHT)
-                    attr = curses.A_BOLD
-                elif "<artist>" in log:
-                    text = log.replace("<artist>", "").replace("</artist>", "")
-                    log_color = curses.color_pair(COLOR_ALT)
-                    attr = curses.A_BOLD
-                elif "<color>" in log:
-                    text = log.replace("<color>", "").replace("</color>", "")
-                    log_color = curses.color_pair(COLOR_WARNING)
-                    attr = curses.A_BOLD
-                elif "<navigation>" in log:
-                    text = log.replace("<navigation>", "").replace("</navigation>", "")
-                    log_color = curses.color_pair(COLOR_INFO)
-                    attr = curses.A_BOLD
-                elif "<playback>" in log:
-                    text = log.replace("<playback>", "").replace("</playback>", "")
-                    log_color = curses.color_pair(COLOR_SUCCESS)
-                    attr = curses.A_BOLD
-                elif "<control>" in log:
-                    text = log.replace("<control>", "").replace("</control>", "")
-                    log_color = curses.color_pair(COLOR_PLAYING)
-                    attr = curses.A_BOLD
-                elif "<connection>" in log:
-                    text = log.replace("<connection>", "").replace("</connection>", "")
-                    log_color = curses.color_pair(COLOR_WARNING)
-                    attr = curses.A_BOLD | curses.A_UNDERLINE
-                elif "<display>" in log:
-                    text = log.replace("<display>", "").replace("</display>", "")
-                    log_color = curses.color_pair(COLOR_PAUSED)
-                    attr = curses.A_BOLD
-                elif "<search>" in log:
-                    text = log.replace("<search>", "").replace("</search>", "")
-                    log_color = curses.color_pair(COLOR_HIGHLIGHT)
-                    attr = curses.A_BOLD
-                elif "<normal>" in log:
-                    text = log.replace("<normal>", "").replace("</normal>", "")
-                    log_color = curses.color_pair(COLOR_DEFAULT)
-                else:
-                    # Fallback for any logs without tags
-                    text = log
-                    log_color = curses.color_pair(COLOR_DEFAULT)
-                
-                # Truncate text if needed
-                text = truncate(text, max_width)
+        # Redraw the rows of logs that are sliding in from the left. Only the logs that are
+        # animating are looked at, not every visible row
+        animated_logs = self.animated_logs
+        parsed = self._parsed
+        write_row = self._write_row
+        frames = self.animation_frames
+        done = frames + 1  # Step of an entry that has been drawn in full
+        end = first + available_lines  # Row just past the last visible one
+        left = self.startx + 1  # Screen column the log text starts at
+        for entry in list(animated_logs):
+            log_index, animation_frame = entry
+            row = log_index - oldest
+            if animation_frame == done or row >= kept:
+                # Finished already, or logged after the snapshot above and starting next frame
+                continue
+            if not first <= row < end:
+                # Dropped, or pushed out of view before it finished; leave it fully drawn
+                entry[1] = done
+                if row >= 0:
+                    write_row(row, *parsed[log_index])
+                continue
+            
+            # Every kept log was parsed when it was written to the pad
+            text, style = parsed[log_index]
+            
+            if animation_frame < frames:
+                # Use an accelerated animation curve to start fast and slow down
+                animation_progress = LOG_EASE[animation_frame]
+                entry[1] = animation_frame + 1
                 
-                # Apply animation for sliding in from left
-                if is_animating:
-                    # For animation: move from far left to normal position
-                    start_x = -len(text)  # Start fully off-screen to the left
-                    end_x = self.startx + 1  # End at normal position
-                    
-                    # Calculate current position based on animation progress
-                    current_x = int(start_x + (end_x - start_x) * animation_progress)
-                    
-                    # Adjust for screen boundaries
-                    if current_x < self.startx + 1:
-                        # When text is partially off-screen, only show visible part
-                        offset = (self.startx + 1) - current_x
-                        visible_length = len(text) - offset
-                        if visible_length > 0:
-                            self.stdscr.attron(log_color | attr)
-                            visible_text = text[offset:offset+visible_length]
-                            self.stdscr.addstr(y, self.startx + 1, visible_text)
-                            self.stdscr.attroff(log_color | attr)
-                    else:
-                        # Text is fully on-screen
-                        self.stdscr.attron(log_color | attr)
-                        self.stdscr.addstr(y, current_x, text)
-                        self.stdscr.attroff(log_color | attr)
-                else:
-                    # Draw normal log (not animating or animation complete)
-                    self.stdscr.attron(log_color | attr)
-                    self.stdscr.addstr(y, self.startx + 1, text)
-                    self.stdscr.attroff(log_color | attr)
+                # Slide from fully off-screen on the left to the normal position, showing
+                # only the part of the text that has come past the window's left edge
+                length = len(text)
+                current_x = int((left + length) * animation_progress - length)
+                write_row(row, text, style, max(0, left - current_x))
+            else:
+                # Finished animating, leave the full line in place
+                entry[1] = done
+                write_row(row, text, style)
+        
+        # Logs animate in the order they were added, so finished ones collect at the front
+        while animated_logs and animated_logs[0][1] == done:
+            animated_logs.popleft()
         
-        # Update animation active state based on whether we have any active animations
-        self.animation_active = has_active_animations
+        # Show the visible rows of the pad inside the border whenever the screen refreshes
+        self.stdscr.overlays["log"] = (
+            self.pad, (first, 0, self.starty + 1, self.startx + 1, self.endy - 1, self.endx - 1)
+        )
+        
+        # Every log still in animated_logs needs another frame, so its size is the count
+        # of active animations
+        self.animation_active = len(self.animated_logs) > 0
 
 class NowPlaying(Component):
     """Component for displaying currently playing track"""
@@ -801,6 +1073,7 @@ class NowPlaying(Component):
         # Avoid using the last row which causes border rendering issues
         self.starty = scry - 4  # Start 4 rows from bottom
         self.endy = scry - 2    # End 2 rows from bottom to avoid rendering issues
+        self._rebuild_border_cache()
         self.component = NowPlayingComponent(
             self.stdscr,
             self.starty,
@@ -809,15 +1082,44 @@ class NowPlaying(Component):
             self.endx
         )
 
+class UILogHandler(logging.Handler):
+    """Logging handler that writes records to the UI's log window"""
+    def __init__(self, ui):
+        super().__init__()
+        self.ui = ui
+    
+    def emit(self, record):
+        try:
+            self.ui.add_log(self.format(record))
+        except Exception:
+            # Never let a rendering problem propagate into the logging call
+            pass
+
 class SpotipyUI:
     """Main UI manager class"""
-    def __init__(self, stdscr, api_client):
-        self.stdscr = stdscr
+    def __init__(self, stdscr, api_client, playback_source=None):
+        # Components draw into the shadow buffer, which forwards only what changed
+        self.stdscr = ShadowBuffer(stdscr)
         self.api_client = api_client
+        # Returns the playback snapshot the server already polls, so the UI doesn't make its own
+        # Spotify calls. Without one, the UI fetches the playback from api_client itself
+        self.playback_source = playback_source
         self.running = True
         self.shutdown_flag = threading.Event()
         self.lock = threading.Lock()
         self.resize_event = threading.Event()
+        # Frame requests for the render thread. Holding at most one means a burst of
+        # requests collapses into a single frame drawn with the latest state
+        self.frame_queue = queue.Queue(maxsize=1)
+        self.frame_rate = 60
+        self.full_redraw = None  # "erase" or "clear" when the next frame must repaint everything
+        self.playback = None  # Latest playback status read by the polling thread
+        self.poll_interval = 1.0  # Seconds between playback updates
+        # The render thread is the only one that touches curses. It reads key presses for
+        # get_key, and applies border colors handed over with set_border_color
+        self.keys = queue.SimpleQueue()
+        self.key_interval = 0.05  # Seconds between key checks while no frame is requested
+        self.border_color = None
         
         # Store initial terminal size
         self.term_height, self.term_width = stdscr.getmaxyx()
@@ -843,17 +1145,20 @@ class SpotipyUI:
         curses.init_pair(COLOR_PLAYING, curses.COLOR_GREEN, -1)  # Playing text
         curses.init_pair(COLOR_PAUSED, curses.COLOR_YELLOW, -1)  # Paused text
         curses.init_pair(COLOR_TIMESTAMP, curses.COLOR_MAGENTA, -1)  # Timestamp text
+        init_color_pairs()
         
         # Try to enable special key handling
         try:
             stdscr.keypad(True)
         except:
             pass
+        # The render thread checks for keys between frames, so getch must never wait
+        stdscr.nodelay(True)
             
         # Initialize UI components
-        self.status_bar = StatusBar(stdscr)
-        self.log_window = LogWindow(stdscr)
-        self.now_playing = NowPlaying(stdscr)
+        self.status_bar = StatusBar(self.stdscr)
+        self.log_window = LogWindow(self.stdscr)
+        self.now_playing = NowPlaying(self.stdscr)
         
         # Add initial log message
         self.log_window.add_log("Starting Resonite Spotipy...")
@@ -861,27 +1166,55 @@ class SpotipyUI:
         # Set up resize handler
         self.setup_resize_handler()
         
-        # Start UI update thread
+        # Start the render thread, which does all drawing, and the UI update thread
+        self.render_thread = threading.Thread(target=self.render_loop)
+        self.render_thread.daemon = True
+        self.render_thread.start()
+        
         self.update_thread = threading.Thread(target=self.update_ui_loop)
         self.update_thread.daemon = True
         self.update_thread.start()
+        
+        # Spotify is polled on its own thread so network waits never hold up a frame
+        self.poll_thread = threading.Thread(target=self.poll_playback_loop)
+        self.poll_thread.daemon = True
+        self.poll_thread.start()
     
     def add_log(self, message):
         """Add a log message to the log window"""
         self.log_window.add_log(message)
-        self.log_window.render(None)
-        self.stdscr.refresh()
+        self.request_frame()
     
     def set_client_status(self, connected, client_id=""):
         """Set the client connection status"""
         self.status_bar.set_client_status(connected, client_id)
-        self.status_bar.render(None)
-        self.stdscr.refresh()
+        self.request_frame()
+    
+    def get_key(self, timeout=None):
+        """Next key pressed, or -1 if none came within timeout seconds"""
+        try:
+            return self.keys.get(timeout=timeout)
+        except queue.Empty:
+            return -1
+    
+    def set_border_color(self, color):
+        """Change the border color, the render thread applies it on the next frame"""
+        self.border_color = color
+        self.redraw_ui()
+    
+    def request_frame(self):
+        """Ask the render thread for a frame; requests made before it gets to one are merged"""
+        try:
+            self.frame_queue.put_nowait(None)
+        except queue.Full:
+            # A frame is already pending and will pick up this change too
+            pass
     
     def shutdown(self):
         """Shutdown the UI"""
         self.running = False
         self.shutdown_flag.set()
+        self.request_frame()  # Wake the render thread so it can exit
         time.sleep(0.2)  # Give update thread time to exit
     
     def setup_resize_handler(self):
@@ -893,62 +1226,44 @@ class SpotipyUI:
                 signal.signal(signal.SIGWINCH, self.handle_resize)
             else:
                 # Windows doesn't have SIGWINCH
-                self.add_log("Using polling for resize detection")
+                self.add_log("Resizes come from KEY_RESIZE")
         except Exception:
-            # Any error means we fall back to polling
-            self.add_log("Using polling for resize detection")
+            # Signals can only be set up from the main thread, the UI normally runs in an executor thread
+            self.add_log("Resizes come from KEY_RESIZE")
     
     def handle_resize(self, signum=None, frame=None):
         """Handle terminal resize event"""
         # Set the resize event flag
         self.resize_event.set()
     
-    def check_resize(self):
-        """Check if terminal dimensions have changed"""
-        try:
-            new_height, new_width = self.stdscr.getmaxyx()
-            if new_height != self.term_height or new_width != self.term_width:
-                self.term_height, self.term_width = new_height, new_width
-                return True
-        except:
-            pass
-        return False
-    
     def resize_ui(self):
-        """Resize and redraw all UI components"""
-        with self.lock:
-            try:
-                # Clear the terminal and reset cursor position
-                self.stdscr.clear()
-                
-                # Store new terminal dimensions
-                self.term_height, self.term_width = self.stdscr.getmaxyx()
-                
-                # Recalculate component dimensions
-                self.status_bar.restart()
-                self.log_window.restart()
-                self.now_playing.restart()
-                
-                # Redraw all components in proper order
-                self.status_bar.render(None)
-                self.log_window.render(None)
-                self.now_playing.render(None)
-                
-                # Refresh the screen
-                self.stdscr.refresh()
-                
-                # Log the resize event (but only if it wasn't the initial setup)
-                if self.running:
-                    self.add_log(f"Terminal resized to {self.term_width}x{self.term_height}")
-            except Exception as e:
-                # Try to log the error, but don't cause additional issues
-                try:
-                    self.add_log(f"Error during resize: {str(e)}")
-                except:
-                    pass
+        """Resize and redraw all UI components on the next frame"""
+        self.resize_event.set()
+        self.request_frame()
+    
+    def _resize(self):
+        """Lay the components out again for the current terminal size (render thread only)"""
+        try:
+            # Clear the terminal and reset cursor position
+            self.stdscr.clear()
             
-            # Clear the resize event flag
-            self.resize_event.clear()
+            # Store new terminal dimensions
+            self.term_height, self.term_width = self.stdscr.getmaxyx()
+            
+            # Recalculate component dimensions
+            self.status_bar.restart()
+            self.log_window.restart()
+            self.now_playing.restart()
+            
+            # Log the resize event (but only if it wasn't the initial setup)
+            if self.running:
+                self.add_log(f"Terminal resized to {self.term_width}x{self.term_height}")
+        except Exception as e:
+            # Try to log the error, but don't cause additional issues
+            try:
+                self.add_log(f"Error during resize: {str(e)}")
+            except:
+                pass
     
     def test_border_colors(self):
         """Test cycling through border colors"""
@@ -965,79 +1280,128 @@ class SpotipyUI:
         
         for name, color in colors:
             self.add_log(f"Testing border color: {name}")
-            curses.init_pair(COLOR_BORDER, color, -1)
-            self.redraw_ui()
+            self.set_border_color(color)
             time.sleep(1)
             
         # Reset to default
-        curses.init_pair(COLOR_BORDER, curses.COLOR_WHITE, -1)
-        self.redraw_ui()
+        self.set_border_color(curses.COLOR_WHITE)
         self.add_log("Border color test complete")
     
-    def redraw_ui(self):
-        """Force redraw of all UI components"""
-        try:
-            with self.lock:
-                self.stdscr.erase()
-                self.status_bar.render(None)
+    def redraw_ui(self, clear=False):
+        """Force redraw of all UI components, clearing the terminal first if clear is set"""
+        self.full_redraw = "clear" if clear else "erase"
+        self.request_frame()
+    
+    def draw_frame(self):
+        """Draw everything that changed since the last frame (render thread only)"""
+        with self.lock:
+            if self.resize_event.is_set():
+                self.resize_event.clear()
+                self._resize()
+            
+            color, self.border_color = self.border_color, None
+            if color is not None:
+                curses.init_pair(COLOR_BORDER, color, -1)
+            
+            redraw, self.full_redraw = self.full_redraw, None
+            if redraw:
+                if redraw == "clear":
+                    self.stdscr.clear()
+                else:
+                    self.stdscr.erase()
+                # The erase wiped what every component last drew
+                for component in (self.status_bar, self.log_window, self.now_playing):
+                    component.component._state_sig = None
+            
+            # Logs added since the last frame are drawn together in one render
+            log_dirty = redraw or self.log_window.component.animation_active or self.log_window._dirty.is_set()
+            self.log_window._dirty.clear()
+            
+            # Components skip themselves if their state hasn't changed since they were last drawn
+            self.status_bar.render(None)
+            if log_dirty:
                 self.log_window.render(None)
-                self.now_playing.render(None)
-                self.stdscr.refresh()
-        except Exception as e:
-            self.add_log(f"Error in redraw: {str(e)}")
+            self.now_playing.render(self.playback)
+            self.stdscr.refresh()
+    
+    def read_keys(self):
+        """Move key presses from curses to the keys queue (render thread only)"""
+        while True:
+            key = self.stdscr.getch()
+            if key == -1:
+                return
+            if key == curses.KEY_RESIZE:
+                # Terminal resized, curses has already resized stdscr
+                self.resize_event.set()
+            else:
+                self.keys.put(key)
+    
+    def render_loop(self):
+        """Render thread: the only thread that uses curses, at most frame_rate frames a second"""
+        frame_interval = 1 / self.frame_rate
+        while not self.shutdown_flag.is_set():
+            try:
+                self.frame_queue.get(timeout=self.key_interval)
+                requested = True
+            except queue.Empty:
+                requested = False
+            if self.shutdown_flag.is_set():
+                break
+            try:
+                self.read_keys()
+            except Exception:
+                pass
+            if not (requested or self.resize_event.is_set()):
+                continue  # Only checked for keys, nothing to draw
+            try:
+                self.draw_frame()
+            except Exception as e:
+                self.add_log(f"UI render error: {str(e)[:50]}")
+            time.sleep(frame_interval)
+    
+    def poll_playback_loop(self):
+        """Playback polling thread: reads the current playback every poll_interval seconds"""
+        while not self.shutdown_flag.is_set():
+            # Update the now playing component with current track info. Swapping in the new
+            # dict is a single assignment, so the render thread never sees a partial update
+            playback = None
+            if self.playback_source:
+                playback = self.playback = self.playback_source()
+            elif self.api_client:
+                try:
+                    playback = self.playback = self.api_client.get_current_playback_full()
+                except Exception as e:
+                    self.add_log(f"Error updating playback info: {str(e)[:50]}")
+            
+            # Apply border coloring from album art, from the same fetch
+            is_animating = self.now_playing.component.animation_active or self.log_window.component.animation_active
+            if playback and playback.get('item') and not is_animating:
+                try:
+                    # Conditionally import to avoid circular imports
+                    import spotify_color
+                    spotify_color.process_current_track(self.stdscr, self, playback)
+                except ImportError:
+                    pass  # Silently ignore if color module not available
+                except Exception:
+                    pass  # Silently ignore errors in color processing
+            self.shutdown_flag.wait(self.poll_interval)
     
     def update_ui_loop(self):
         """UI update loop running in a separate thread"""
         # Use consistent animation interval of 0.04s for all updates
         animation_interval = 0.04
-        resize_check_counter = 0
         
         try:
             while not self.shutdown_flag.is_set():
                 try:
-                    # Check for a resize event (every 5 frames to avoid constant checking)
-                    resize_check_counter += 1
-                    if resize_check_counter >= 5:
-                        resize_check_counter = 0
-                        if self.resize_event.is_set() or self.check_resize():
-                            self.resize_ui()
+                    # Resizes arrive as KEY_RESIZE or SIGWINCH and set resize_event, which the
+                    # frame requested below picks up, so there's nothing to poll here
                     
                     # Always use the animation interval for smooth animations
                     interval = animation_interval
                     
-                    # Check if there's an active animation
-                    now_playing_animating = hasattr(self.now_playing.component, 'animation_active') and self.now_playing.component.animation_active
-                    log_animating = hasattr(self.log_window.component, 'animation_active') and self.log_window.component.animation_active
-                    is_animating = now_playing_animating or log_animating
-                    
-                    # Update the now playing component with current track info
-                    if self.api_client:
-                        try:
-                            status = self.api_client.get_current_playback_full()
-                            with self.lock:
-                                # Update log window first to ensure animations are processed
-                                if log_animating:
-                                    self.log_window.render(None)
-                                self.now_playing.render(status)
-                                self.stdscr.refresh()
-                        except Exception as e:
-                            self.add_log(f"Error updating playback info: {str(e)[:50]}")
-                    
-                    # Apply border coloring from album art
-                    if self.api_client and not is_animating:
-                        try:
-                            track_data = self.api_client.get_current_playback_full()
-                            
-                            # Only process colors if we have track data
-                            if track_data and 'item' in track_data and track_data['item']:
-                                # Conditionally import to avoid circular imports
-                                try:
-                                    import spotify_color
-                                    spotify_color.process_current_track(self.stdscr, self, track_data)
-                                except ImportError:
-                                    pass  # Silently ignore if color module not available
-                        except:
-                            pass  # Silently ignore API errors for color processing
+                    # Every tick is a frame, which is what keeps the animations moving
+                    self.request_frame()
                     
                     # Sleep for the animation interval
                     time.sleep(interval)
@@ -1053,6 +1417,21 @@ class SpotipyUI:
             except:
                 pass
 
+# Border color picked by each number key: 1 red, 2 green, 3 yellow, 4 blue, 5 magenta,
+# 6 cyan, 7 white (default)
+COLOR_KEYS = {
+    ord(str(number)): color
+    for number, color in enumerate((
+        curses.COLOR_RED,
+        curses.COLOR_GREEN,
+        curses.COLOR_YELLOW,
+        curses.COLOR_BLUE,
+        curses.COLOR_MAGENTA,
+        curses.COLOR_CYAN,
+        curses.COLOR_WHITE
+    ), start=1)
+}
+
 def curses_main(stdscr):
     global UI, API, CLIENT
     
@@ -1062,39 +1441,18 @@ def curses_main(stdscr):
     # Initialize UI
     UI = SpotipyUI(stdscr, CLIENT)
     
-    # Wait for user to quit
+    # Wait for user to quit. Keys come from the render thread, which also handles resizes
     while True:
         try:
-            key = stdscr.getch()
-            if key == ord('q'):  # Quit on 'q'
+            key = UI.get_key()
+            if key in COLOR_KEYS:  # Border color on 1-7
+                UI.set_border_color(COLOR_KEYS[key])
+            elif key == ord('q'):  # Quit on 'q'
                 break
             elif key == ord('r'):  # Refresh on 'r'
                 UI.resize_ui()  # Use same function for manual refresh
             elif key == ord('c'):  # Test cycling colors with 'c'
                 UI.test_border_colors()
-            elif key == curses.KEY_RESIZE:  # Handle terminal resize
-                UI.handle_resize()
-            elif key == ord('1'):  # Red
-                curses.init_pair(17, curses.COLOR_RED, -1)
-                UI.redraw_ui()
-            elif key == ord('2'):  # Green
-                curses.init_pair(17, curses.COLOR_GREEN, -1)
-                UI.redraw_ui()
-            elif key == ord('3'):  # Yellow
-                curses.init_pair(17, curses.COLOR_YELLOW, -1)
-                UI.redraw_ui()
-            elif key == ord('4'):  # Blue
-                curses.init_pair(17, curses.COLOR_BLUE, -1)
-                UI.redraw_ui()
-            elif key == ord('5'):  # Magenta
-                curses.init_pair(17, curses.COLOR_MAGENTA, -1)
-                UI.redraw_ui()
-            elif key == ord('6'):  # Cyan
-                curses.init_pair(17, curses.COLOR_CYAN, -1)
-                UI.redraw_ui()
-            elif key == ord('7'):  # White (default)
-                curses.init_pair(17, curses.COLOR_WHITE, -1)
-                UI.redraw_ui()
             elif key == ord('u'):  # Test URL color update with 'u'
                 # Test with a known album art URL
                 UI.add_log("Testing manual URL color update...")
@@ -9,7 +9,7 @@ It uses HSV color space analysis to identify the most vibrant/saturated colors
 in album artwork, then maps them to the closest curses terminal color.
 
 Key features:
-- Extracts multiple dominant colors using K-means clustering
+- Extracts multiple dominant colors using octree quantization
 - Scores colors based on saturation, brightness, and prevalence
 - Maps RGB colors to terminal colors using HSV perceptual distance
 - Caches results for performance
@@ -18,6 +18,7 @@ Key features:
 Functions:
 - get_dominant_colors: Extract multiple colors from an image
 - get_saturated_color: Find the most vibrant color from a set
+- pick_vibrant: Find the most vibrant color covering part of an image, in one pass
 - rgb_to_curses_color: Map RGB colors to terminal colors
 - process_current_track: Extract colors from current Spotify track
 
@@ -29,6 +30,9 @@ Usage:
     
     # Direct color extraction
     image_data = spotify_color.fetch_album_art(album_url)
+    vibrant_color = spotify_color.pick_vibrant(image_data)
+    
+    # Or through the palette, as the debug paths do
     dominant_colors = spotify_color.get_dominant_colors(image_data)
     vibrant_color = spotify_color.get_saturated_color(dominant_colors)
     curses_color = spotify_color.rgb_to_curses_color(vibrant_color)
@@ -38,21 +42,46 @@ import os
 import sys
 import time
 import curses
+import atexit
+import shelve
+import logging
+import hashlib
 import requests
 import threading
+from requests.adapters import HTTPAdapter
 import numpy as np
 from PIL import Image
 from io import BytesIO
-from collections import Counter
-from sklearn.cluster import KMeans
-from sklearn.metrics import silhouette_score
-import joblib
 import colorsys
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from cachetools import LRUCache, TTLCache, cached
 
-MODEL_PATH = 'kmeans_model.joblib'
-COLOR_CACHE = {}  # Cache colors by album URL to avoid reprocessing
+# Caches by album URL to avoid reprocessing, bounded so a long session doesn't grow forever.
+_RGB_CACHE = LRUCache(maxsize=256)
+_CURSES_CACHE = LRUCache(maxsize=256)
+_CACHE_LOCK = threading.Lock()  # Color extraction runs in worker threads
+# Albums whose art couldn't be fetched, so they fail right away instead of downloading again every poll
+FAILED_RETRY_AFTER = 300  # Seconds before a failed album is tried again
+_FAILED_URLS = TTLCache(maxsize=64, ttl=FAILED_RETRY_AFTER)
+# Album art bytes and curses colors are kept on disk, so replaying an album after a restart skips the work
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "resonite_spotipy")
+ART_CACHE_DIR = os.path.join(CACHE_DIR, "art")
+_DISK_SYNC_EVERY = 16  # Flush the color shelf every this many new albums instead of on every write
+_disk_writes = 0
+# Reuse connections to the image CDN instead of a new TLS handshake per cover
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+_MISSING = object()  # Tells a cache miss apart from a cached value
 CURRENT_COLOR = None
 COLOR_LOCK = threading.Lock()
+# One worker handles border updates; only the newest requested album is processed
+_COLOR_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="color")
+_LATEST_REQUEST = None  # (ui_instance, album_url, deadline) waiting for the worker
+_IN_FLIGHT_URL = None  # Album the worker is extracting right now
+_BORDER_URL = None  # Album the border color was last taken from
+DEBOUNCE_DELAY = 0.25  # Seconds a track has to stay current before its color is extracted
+MIN_BUCKET_SHARE = 0.25  # Percent of the pixels a pick_vibrant bucket needs, so a stray speck can't win
 DEBUG = False  # Debug flag
 
 # RGB to curses color mapping with improved values
@@ -67,72 +96,49 @@ CURSES_COLORS = {
     'white': (220, 220, 220)    # Off-white
 }
 
-def debug_log(message):
-    """Print debug messages to a file (to avoid corrupting curses display)"""
-    if DEBUG:
-        with open("color_debug.log", "a") as f:
-            f.write(f"[{time.strftime('%H:%M:%S')}] {message}\n")
-
-def train_kmeans(pixels, max_k=10):
-    """Train a KMeans model to find optimal clusters for color extraction.
-    
-    Args:
-        pixels: Numpy array of pixel values
-        max_k: Maximum number of clusters to try
-        
-    Returns:
-        Trained KMeans model with optimal number of clusters
-    """
-    best_k = 1
-    best_score = -1
-    best_model = None
-
-    for k in range(2, max_k + 1):
-        kmeans = KMeans(n_clusters=k, n_init='auto')
-        labels = kmeans.fit_predict(pixels)
-        
-        # Skip single item clusters
-        if len(np.unique(labels)) < 2:
-            continue
-            
-        score = silhouette_score(pixels, labels)
+# Debug messages go to a file (to avoid corrupting curses display) once debugging is enabled.
+# Until then the logger is above every level, so disabled calls return right away
+log = logging.getLogger("spotify_color")
+log.setLevel(logging.CRITICAL + 1)
+log.propagate = False
+_DEBUG_HANDLER = None
 
-        if score > best_score:
-            best_k = k
-            best_score = score
-            best_model = kmeans
-
-    # Fallback if no good model was found
-    if best_model is None:
-        best_model = KMeans(n_clusters=3, n_init='auto').fit(pixels)
-        
-    return best_model
+def _start_debug_log(mode):
+    """Send debug messages to color_debug.log through one handler that keeps the file open"""
+    global DEBUG, _DEBUG_HANDLER
+    DEBUG = True
+    if _DEBUG_HANDLER is None:
+        _DEBUG_HANDLER = logging.FileHandler("color_debug.log", mode=mode)
+        _DEBUG_HANDLER.setFormatter(logging.Formatter("[%(asctime)s] %(message)s", "%H:%M:%S"))
+        log.addHandler(_DEBUG_HANDLER)
+    log.setLevel(logging.DEBUG)
 
-def update_kmeans_model(pixels):
-    """Update an existing KMeans model with new pixel data.
-    
-    Args:
-        pixels: Numpy array of pixel values
-        
-    Returns:
-        Updated KMeans model
-    """
+def _open_disk_cache():
+    """Open the shelf of album URL -> curses color, or return None if it can't be opened"""
     try:
-        if os.path.exists(MODEL_PATH):
-            existing_model = joblib.load(MODEL_PATH)
-            combined_data = np.vstack([existing_model.cluster_centers_, pixels])
-        else:
-            combined_data = pixels
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        cache = shelve.open(os.path.join(CACHE_DIR, "colors.db"))
+    except Exception:
+        return None  # Another instance may hold it, colors then just stay in memory
+    
+    def close():
+        with _CACHE_LOCK:
+            cache.close()
+    atexit.register(close)
+    return cache
 
-        new_model = train_kmeans(combined_data)
-        joblib.dump(new_model, MODEL_PATH)
-        return new_model
-    except Exception as e:
-        print(f"Error updating KMeans model: {e}")
-        # Fallback to direct KMeans without model persistence
-        return KMeans(n_clusters=5, n_init='auto').fit(pixels)
+# Opened on first use by _disk_cache, so importing the module doesn't touch the cache directory
+_DISK_CACHE = _MISSING
+
+def _disk_cache():
+    """Return the color shelf, opening it the first time. Call with _CACHE_LOCK held."""
+    global _DISK_CACHE
+    if _DISK_CACHE is _MISSING:
+        _DISK_CACHE = _open_disk_cache()
+    return _DISK_CACHE
 
 # Convert RGB to HSV for better color comparison
+@lru_cache(maxsize=4096)
 def rgb_to_hsv(rgb):
     """Convert RGB color to HSV color space for better perceptual analysis.
     
@@ -147,8 +153,60 @@ def rgb_to_hsv(rgb):
     h, s, v = colorsys.rgb_to_hsv(r, g, b)
     return (h, s, v)
 
+def rgb_to_hsv_np(rgb):
+    """Convert a whole array of RGB colors to HSV at once.
+    
+    Vectorized version of rgb_to_hsv, using the same formulas as colorsys.
+    
+    Args:
+        rgb: Array-like of shape (N, 3) with r, g, b values (0-255)
+        
+    Returns:
+        Float array of shape (N, 3) with h, s, v columns (each 0-1)
+    """
+    rgb = np.asarray(rgb, dtype=np.float64) / 255.0  # Normalize to 0-1
+    r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+    cmax = rgb.max(axis=-1)
+    delta = cmax - rgb.min(axis=-1)
+    
+    # Divide by 1 where the result gets masked out anyway, to keep out of divide-by-zero
+    safe_delta = np.where(delta > 0, delta, 1.0)
+    safe_cmax = np.where(cmax > 0, cmax, 1.0)
+    
+    # Hue comes from whichever channel is largest
+    h = np.select(
+        [cmax == r, cmax == g],
+        [(g - b) / safe_delta, 2.0 + (b - r) / safe_delta],
+        4.0 + (r - g) / safe_delta
+    )
+    h = np.where(delta > 0, (h / 6.0) % 1.0, 0.0)
+    s = np.where(cmax > 0, delta / safe_cmax, 0.0)
+    return np.stack([h, s, cmax], axis=-1)
+
+# CURSES_COLORS as parallel arrays, so rgb_to_curses_color can compare against
+# every entry at once. Black maps to white to stay visible on a black background.
+_CURSES_NAMES = list(CURSES_COLORS)
+_CURSES_CONSTS = np.array([
+    curses.COLOR_WHITE if name in ('black', 'white') else getattr(curses, f"COLOR_{name.upper()}")
+    for name in _CURSES_NAMES
+], dtype=np.int32)
+_CURSES_HSV = rgb_to_hsv_np(list(CURSES_COLORS.values()))
+
+def _load_small(image_data):
+    """Decode image bytes straight to a 64x64 RGB image.
+    
+    A few thousand pixels are plenty to find the main colors. draft() lets libjpeg
+    decode JPEGs at 1/2, 1/4 or 1/8 scale instead of full size, and nearest-neighbour
+    is the cheapest filter for the rest since blending doesn't matter here.
+    """
+    image = Image.open(BytesIO(image_data))
+    image.draft('RGB', (64, 64))
+    if image.mode != 'RGB':  # convert() copies even when there's nothing to convert
+        image = image.convert('RGB')
+    return image.resize((64, 64), Image.Resampling.NEAREST)
+
 def get_dominant_colors(image_data, n_colors=5):
-    """Extract multiple dominant colors from image data using K-means clustering.
+    """Extract multiple dominant colors from image data using octree quantization.
     
     Args:
         image_data: Raw image bytes
@@ -158,37 +216,27 @@ def get_dominant_colors(image_data, n_colors=5):
         List of tuples: [(color, percentage), ...] where color is (r, g, b)
     """
     try:
-        debug_log(f"Extracting dominant colors from image ({len(image_data)} bytes)")
+        log.debug("Extracting dominant colors from image (%s bytes)", len(image_data))
         
-        # Load image from bytes
-        image = Image.open(BytesIO(image_data)).convert('RGB')
+        # Load a shrunk copy of the image, quantizing doesn't need the full size
+        image = _load_small(image_data)
         
-        # Resize for faster processing, but keep enough detail
-        image = image.resize((150, 150))
-        
-        # Convert to numpy array
-        image_array = np.array(image)
-        pixels = image_array.reshape((-1, 3))
-        
-        # Use KMeans to find color clusters
-        kmeans = KMeans(n_clusters=n_colors, n_init='auto').fit(pixels)
-        colors = kmeans.cluster_centers_
-        
-        # Count pixel assignments to find dominant colors
-        labels = kmeans.labels_
-        counts = Counter(labels)
+        # Octree quantization picks the palette and maps every pixel onto it in Pillow's C code
+        palette_image = image.quantize(colors=n_colors, method=Image.Quantize.FASTOCTREE)
+        palette = palette_image.getpalette()
+        total = image.width * image.height
         
         # Get colors sorted by frequency (most common first)
         dominant_colors = []
-        for i in counts.most_common(n_colors):
-            color = tuple(map(int, colors[i[0]]))
-            pct = i[1] / len(labels) * 100
+        for count, index in sorted(palette_image.getcolors(), reverse=True)[:n_colors]:
+            color = tuple(palette[index * 3:index * 3 + 3])
+            pct = count / total * 100
             dominant_colors.append((color, pct))
             
-        debug_log(f"Extracted {len(dominant_colors)} dominant colors")
+        log.debug("Extracted %s dominant colors", len(dominant_colors))
         return dominant_colors
     except Exception as e:
-        debug_log(f"Error extracting dominant colors: {e}")
+        log.debug("Error extracting dominant colors: %s", e)
         return [((255, 255, 255), 100)]  # Default white
 
 def get_saturated_color(colors):
@@ -203,52 +251,97 @@ def get_saturated_color(colors):
     Returns:
         Tuple (r, g, b) of the most vibrant color
     """
+    # Palettes are small tuples of tuples, so identical ones can be memoized
+    return _saturated_color(tuple(colors))
+
+@lru_cache(maxsize=1024)
+def _saturated_color(colors):
+    """Memoized body of get_saturated_color, keyed by the palette tuple."""
     if not colors:
         return (255, 255, 255)  # Default to white
-        
-    max_score = 0
-    most_saturated = colors[0][0]  # Default to most common color
     
     # Minimum saturation threshold to consider a color "pigmented"
     min_saturation = 0.15
     
-    debug_log(f"Finding most pigmented color from {len(colors)} colors")
+    log.debug("Finding most pigmented color from %s colors", len(colors))
     
-    for color, pct in colors:
-        h, s, v = rgb_to_hsv(color)
-        
-        # Skip very dark colors (low value)
-        if v < 0.15:
-            debug_log(f"Skipping dark color {color} (v={v:.2f})")
-            continue
+    # Score the whole palette at once
+    hsv = rgb_to_hsv_np([color for color, _ in colors])
+    s, v = hsv[:, 1], hsv[:, 2]
+    pcts = np.array([pct for _, pct in colors], dtype=np.float64)
+    
+    # Heavy emphasis on saturation (pigmentation), but still consider color prevalence
+    # Saturation is now squared to prioritize highly saturated colors
+    saturation_weight = 4.0  # Increased from default of 1.0
+    prevalence_weight = 0.3  # Reduced from default of 1.0
+    value_bonus = 0.7  # Bonus for mid-range brightness (not too dark or light)
+    
+    # Value bonus peaks at around 0.7 (medium brightness)
+    brightness_factor = 1.0 - np.abs(v - 0.7) * 0.5
+    
+    # Calculate score with higher weight on saturation (pigmentation)
+    score = (s * s * saturation_weight) + (pcts * prevalence_weight / 100) + (brightness_factor * value_bonus)
+    
+    # Skip very dark colors (low value) and very light/white colors, and only consider
+    # "pigmented" colors above the saturation threshold
+    valid = (v >= 0.15) & ~((s < 0.1) & (v > 0.9)) & (s >= min_saturation)
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("HSV: %s, Scores: %s, Valid: %s", np.round(hsv, 2).tolist(), np.round(score, 2).tolist(), valid.tolist())
+    
+    if valid.any():
+        # argmax keeps the first of equal scores, like the strict > comparison used to
+        most_saturated = colors[int(np.where(valid, score, -np.inf).argmax())][0]
+    else:
+        most_saturated = colors[0][0]  # Default to most common color
             
-        # Skip very light/white colors
-        if s < 0.1 and v > 0.9:
-            debug_log(f"Skipping near-white color {color} (s={s:.2f}, v={v:.2f})")
-            continue
-        
-        # Heavy emphasis on saturation (pigmentation), but still consider color prevalence
-        # Saturation is now squared to prioritize highly saturated colors
-        saturation_weight = 4.0  # Increased from default of 1.0
-        prevalence_weight = 0.3  # Reduced from default of 1.0
-        value_bonus = 0.7  # Bonus for mid-range brightness (not too dark or light)
-        
-        # Value bonus peaks at around 0.7 (medium brightness)
-        brightness_factor = 1.0 - abs(v - 0.7) * 0.5
-        
-        # Calculate score with higher weight on saturation (pigmentation)
-        score = (s * s * saturation_weight) + (pct * prevalence_weight / 100) + (brightness_factor * value_bonus)
+    log.debug("Selected most pigmented color: %s", most_saturated)
+    return most_saturated
+
+def pick_vibrant(image_data):
+    """Find the most vibrant color of an image without building a palette first.
+    
+    Buckets the pixels of a downsampled copy into a 5-bit-per-channel histogram,
+    then scores the non-empty buckets with the weighting of get_saturated_color,
+    all in one vectorized pass. Buckets under MIN_BUCKET_SHARE of the image are
+    left out, since the saturation term outweighs prevalence by far.
+    
+    Args:
+        image_data: Raw image bytes
         
-        debug_log(f"Color: {color}, HSV: ({h:.2f}, {s:.2f}, {v:.2f}), Score: {score:.2f}")
+    Returns:
+        Tuple (r, g, b) of the most vibrant color
+    """
+    try:
+        pixels = np.asarray(_load_small(image_data)).reshape(-1, 3)
+        
+        # Pack the top 5 bits of each channel into one 15-bit bucket key
+        q = (pixels >> 3).astype(np.uint16)
+        keys = (q[:, 0] << 10) | (q[:, 1] << 5) | q[:, 2]
+        counts = np.bincount(keys, minlength=1 << 15)
+        
+        # Album art only fills a small part of the histogram, so just the used buckets are scored
+        buckets = counts.nonzero()[0]
+        centers = np.stack([(buckets >> 10) & 31, (buckets >> 5) & 31, buckets & 31], axis=-1) * 8 + 4
+        hsv = rgb_to_hsv_np(centers)
+        s, v = hsv[:, 1], hsv[:, 2]
+        pcts = counts[buckets] * (100 / len(pixels))
+        
+        # Same weights and filters as get_saturated_color, whose palette colors always have some coverage
+        score = s * s * 4.0 + pcts * 0.3 / 100 + (1.0 - np.abs(v - 0.7) * 0.5) * 0.7
+        valid = (v >= 0.15) & ~((s < 0.1) & (v > 0.9)) & (s >= 0.15) & (pcts >= MIN_BUCKET_SHARE)
+        
+        if valid.any():
+            best = buckets[np.where(valid, score, -np.inf).argmax()]
+        else:
+            best = buckets[counts[buckets].argmax()]  # Nothing pigmented, use the most common bucket
         
-        # Only consider "pigmented" colors above the saturation threshold
-        if s >= min_saturation and score > max_score:
-            max_score = score
-            most_saturated = color
-            debug_log(f"New best color: {color} with score {score:.2f}")
-            
-    debug_log(f"Selected most pigmented color: {most_saturated}")
-    return most_saturated
+        # Average the pixels in the winning bucket instead of returning its center
+        vibrant = tuple(int(c) for c in pixels[keys == best].mean(axis=0).round())
+        log.debug("Selected most vibrant color: %s (%s buckets)", vibrant, len(buckets))
+        return vibrant
+    except Exception as e:
+        log.debug("Error picking vibrant color: %s", e)
+        return (255, 255, 255)  # Default white
 
 def color_distance_hsv(color1, color2):
     """Calculate perceptual color distance in HSV space.
@@ -277,6 +370,7 @@ def color_distance_hsv(color1, color2):
     
     return distance
 
+@lru_cache(maxsize=4096)
 def rgb_to_curses_color(rgb):
     """Map an RGB color to the closest curses color using HSV distance.
     
@@ -286,39 +380,18 @@ def rgb_to_curses_color(rgb):
     Returns:
         Curses color constant (e.g., curses.COLOR_RED)
     """
-    min_distance = float('inf')
-    closest_color = curses.COLOR_WHITE  # Default to white
-    
-    debug_log(f"Finding closest curses color for RGB: {rgb}")
-    
-    # Find closest basic color using HSV perceptual distance
-    for color_name, color_rgb in CURSES_COLORS.items():
-        distance = color_distance_hsv(rgb, color_rgb)
-        debug_log(f"Distance to {color_name}: {distance:.3f}")
-        
-        if distance < min_distance:
-            min_distance = distance
-            
-            # Map color name to curses constant
-            if color_name == 'black':
-                # Avoid black (invisible on black bg)
-                closest_color = curses.COLOR_WHITE
-            elif color_name == 'red':
-                closest_color = curses.COLOR_RED
-            elif color_name == 'green':
-                closest_color = curses.COLOR_GREEN
-            elif color_name == 'yellow':
-                closest_color = curses.COLOR_YELLOW
-            elif color_name == 'blue':
-                closest_color = curses.COLOR_BLUE
-            elif color_name == 'magenta':
-                closest_color = curses.COLOR_MAGENTA
-            elif color_name == 'cyan':
-                closest_color = curses.COLOR_CYAN
-            elif color_name == 'white':
-                closest_color = curses.COLOR_WHITE
-    
-    debug_log(f"Selected curses color: {closest_color}")
+    log.debug("Finding closest curses color for RGB: %s", rgb)
+    
+    # Same HSV perceptual distance as color_distance_hsv, against every curses color at once
+    h, s, v = rgb_to_hsv(rgb)
+    h_diff = np.abs(h - _CURSES_HSV[:, 0])
+    h_dist = np.minimum(h_diff, 1 - h_diff)  # Hue is circular (0=360)
+    distance = 0.6 * h_dist + 0.3 * np.abs(s - _CURSES_HSV[:, 1]) + 0.1 * np.abs(v - _CURSES_HSV[:, 2])
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("Distances: %s", dict(zip(_CURSES_NAMES, np.round(distance, 3).tolist())))
+    
+    closest_color = int(_CURSES_CONSTS[distance.argmin()])
+    log.debug("Selected curses color: %s", closest_color)
     return closest_color
 
 def get_brightness(rgb):
@@ -347,41 +420,47 @@ def get_color_for_album(album_url):
     Returns:
         Curses color constant (e.g., curses.COLOR_RED)
     """
-    global COLOR_CACHE
+    global _disk_writes
     
-    debug_log(f"Getting color for album: {album_url}")
+    log.debug("Getting color for album: %s", album_url)
     
     if not album_url:
-        debug_log("No album URL provided, using default white")
+        log.debug("No album URL provided, using default white")
         return curses.COLOR_WHITE  # Default color
         
-    # Check the cache first
-    if album_url in COLOR_CACHE:
-        debug_log(f"Using cached color for album: {COLOR_CACHE[album_url]}")
-        return COLOR_CACHE[album_url]
+    # Check the caches first, promoting colors from earlier sessions to memory
+    with _CACHE_LOCK:
+        cached_color = _CURSES_CACHE.get(album_url, _MISSING)
+        if cached_color is _MISSING and _disk_cache() is not None:
+            cached_color = _DISK_CACHE.get(album_url, _MISSING)
+            if cached_color is not _MISSING:
+                _CURSES_CACHE[album_url] = cached_color
+    if cached_color is not _MISSING:
+        log.debug("Using cached color for album: %s", cached_color)
+        return cached_color
     
-    # Fetch and process the image
-    image_data = fetch_album_art(album_url)
-    if not image_data:
-        debug_log("No image data returned, using default white")
+    try:
+        vibrant_color = _extract_rgb(album_url)
+    except Exception as e:
+        log.debug("%s, using default white", e)
         return curses.COLOR_WHITE
     
-    # Extract dominant colors
-    dominant_colors = get_dominant_colors(image_data, n_colors=8)
-    
-    # Find the most vibrant color
-    vibrant_color = get_saturated_color(dominant_colors)
-    
     # Map to nearest curses color with enhanced algorithm
     curses_color = rgb_to_curses_color(vibrant_color)
     
     # Cache the result
-    COLOR_CACHE[album_url] = curses_color
+    with _CACHE_LOCK:
+        _CURSES_CACHE[album_url] = curses_color
+        if _disk_cache() is not None:
+            _DISK_CACHE[album_url] = curses_color
+            _disk_writes += 1
+            if _disk_writes % _DISK_SYNC_EVERY == 0:
+                _DISK_CACHE.sync()
     
     return curses_color
 
 def fetch_album_art(album_url):
-    """Fetch the album art from Spotify.
+    """Fetch the album art from Spotify, or from the disk cache if it was fetched before.
     
     Args:
         album_url: URL to the album art
@@ -389,16 +468,65 @@ def fetch_album_art(album_url):
     Returns:
         Raw image data bytes
     """
+    # Album art URLs point at immutable CDN files, so a cached copy never goes stale
+    cache_path = os.path.join(ART_CACHE_DIR, hashlib.blake2b(album_url.encode(), digest_size=16).hexdigest())
     try:
-        response = requests.get(album_url, timeout=5)
+        with open(cache_path, 'rb') as f:
+            return f.read()
+    except OSError:
+        pass
+    
+    try:
+        response = _SESSION.get(album_url, timeout=5)
         if response.status_code == 200:
-            return response.content
+            image_data = response.content
         else:
-            debug_log(f"Error fetching album art: HTTP {response.status_code}")
+            log.debug("Error fetching album art: HTTP %s", response.status_code)
             return None
     except Exception as e:
-        debug_log(f"Exception fetching album art: {e}")
+        log.debug("Exception fetching album art: %s", e)
         return None
+    
+    try:
+        os.makedirs(ART_CACHE_DIR, exist_ok=True)
+        # Write to a temp file first so a crash can't leave a truncated image behind
+        temp_path = f"{cache_path}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(image_data)
+        os.replace(temp_path, cache_path)
+    except OSError as e:
+        log.debug("Couldn't cache album art: %s", e)
+    return image_data
+
+@cached(_RGB_CACHE, lock=_CACHE_LOCK)
+def _extract_rgb(album_url):
+    """Extract the most vibrant color of an album art URL, memoized by URL.
+    
+    Album art URLs are stable CDN URLs, so the download and extraction only
+    have to happen once per album. Raises if the art can't be fetched so that
+    failures aren't memoized; they're remembered in _FAILED_URLS instead, so
+    both the border and the hex color path skip the download for
+    FAILED_RETRY_AFTER seconds.
+    
+    Args:
+        album_url: URL to the album art
+        
+    Returns:
+        Tuple (r, g, b) of the most vibrant color
+    """
+    # @cached holds _CACHE_LOCK only around lookups and stores, not while this runs
+    with _CACHE_LOCK:
+        if album_url in _FAILED_URLS:
+            raise ValueError(f"No image data for {album_url} (failed recently)")
+    
+    # Fetch and process the album art
+    image_data = fetch_album_art(album_url)
+    if not image_data:
+        with _CACHE_LOCK:
+            _FAILED_URLS[album_url] = True
+        raise ValueError(f"No image data for {album_url}")
+        
+    return pick_vibrant(image_data)
 
 def get_dominant_color(album_url):
     """Get the dominant color in hex format from an album art URL.
@@ -410,94 +538,115 @@ def get_dominant_color(album_url):
         Hex color code (e.g. "#FF5733") or None if error
     """
     try:
-        # Check if we have this color cached
-        if album_url in COLOR_CACHE:
-            rgb_color = COLOR_CACHE[album_url]
-        else:
-            # Fetch and process the album art
-            image_data = fetch_album_art(album_url)
-            if not image_data:
-                return None
-                
-            # Get dominant colors
-            dominant_colors = get_dominant_colors(image_data)
-            
-            # Get the most vibrant color
-            rgb_color = get_saturated_color(dominant_colors)
-            
-            # Cache the result
-            COLOR_CACHE[album_url] = rgb_color
-        
-        # Convert RGB to hex
-        hex_color = "#{:02x}{:02x}{:02x}".format(rgb_color[0], rgb_color[1], rgb_color[2])
-        return hex_color
-        
+        rgb_color = _extract_rgb(album_url)
     except Exception as e:
-        debug_log(f"Error getting dominant color: {e}")
+        log.debug("Error getting dominant color: %s", e)
         return None
+    
+    # Convert RGB to hex
+    return "#{:02x}{:02x}{:02x}".format(rgb_color[0], rgb_color[1], rgb_color[2])
 
 def update_border_color(stdscr, ui_instance, album_url):
     """Update the border color based on album artwork.
     
-    Uses threading to avoid blocking the main UI during processing.
+    Processing runs on a single background worker to avoid blocking the main UI.
+    Requests are debounced, so when tracks change in quick succession only the
+    newest album is processed. Albums the border already shows, or that are
+    already pending or being extracted, are skipped.
     
     Args:
         stdscr: Curses screen object
         ui_instance: ResoniteUI instance
         album_url: URL to album artwork image
     """
-    global CURRENT_COLOR, COLOR_LOCK
+    global _LATEST_REQUEST
     
-    debug_log(f"Updating border color for album: {album_url}")
+    log.debug("Updating border color for album: %s", album_url)
     
     # Skip if no album URL or UI
     if not album_url or not ui_instance:
-        debug_log("Missing album URL or UI instance, skipping color update")
+        log.debug("Missing album URL or UI instance, skipping color update")
         return
     
-    # Process in a separate thread to avoid blocking
-    def process_color():
-        global CURRENT_COLOR, COLOR_LOCK
-        
-        debug_log("Starting color processing thread")
-        
-        # Get color for this album
+    with COLOR_LOCK:
+        already_queued = _LATEST_REQUEST is not None
+        # Playback is polled every second, so most calls repeat the album already pending,
+        # being extracted, or shown. Those mustn't push the deadline back or restart the work
+        if already_queued and _LATEST_REQUEST[1] == album_url:
+            return
+        if album_url == (_IN_FLIGHT_URL or _BORDER_URL):
+            # Switched back before any pending album started, so the result in progress (or shown) is right again
+            _LATEST_REQUEST = None
+            return
+        # Otherwise this request also marks a different album in progress as stale. When it asks
+        # for the album already shown, the worker drops it once it's due and the border stays as is
+        # A queued job picks up whatever is in the slot when it runs, so only submit when empty
+        _LATEST_REQUEST = (ui_instance, album_url, time.monotonic() + DEBOUNCE_DELAY)
+    if not already_queued:
+        _COLOR_EXECUTOR.submit(_process_latest_color)
+        log.debug("Color processing job submitted")
+
+def _process_latest_color():
+    """Worker job for update_border_color: color the border for the newest requested album"""
+    global _LATEST_REQUEST, _IN_FLIGHT_URL, _BORDER_URL
+    
+    # Wait until no newer request has come in for DEBOUNCE_DELAY, each one pushes the deadline back
+    while True:
+        with COLOR_LOCK:
+            if _LATEST_REQUEST is None:
+                return
+            ui_instance, album_url, deadline = _LATEST_REQUEST
+            delay = deadline - time.monotonic()
+            if delay <= 0:
+                _LATEST_REQUEST = None
+                if album_url == _BORDER_URL:
+                    return  # Switched back to the album already shown
+                _IN_FLIGHT_URL = album_url
+                break
+        time.sleep(delay)
+    
+    log.debug("Starting color processing")
+    
+    # Get color for this album
+    try:
         curses_color = get_color_for_album(album_url)
-        
+    finally:
         with COLOR_LOCK:
-            debug_log(f"Current color: {CURRENT_COLOR}, New color: {curses_color}")
-            
-            # Always update the color pair (don't check if it's the same)
-            CURRENT_COLOR = curses_color
-            
-            # Define a custom color pair for the border
-            try:
-                # Get the actual COLOR_BORDER value from the UI module
-                from resonite_ui import COLOR_BORDER
-                debug_log(f"Updating color pair {COLOR_BORDER} to color: {curses_color}")
-                
-                # Force update the color pair
-                curses.init_pair(COLOR_BORDER, curses_color, -1)
-                
-                # Force refresh of UI components
-                debug_log("Triggering UI refresh")
-                ui_instance.redraw_ui()  # Use the new redraw_ui method
-                debug_log("UI refresh completed")
-            except Exception as e:
-                debug_log(f"Error updating color: {e}")
-                # Fallback to hardcoded color pair number
-                try:
-                    debug_log("Trying fallback with hardcoded color pair 17")
-                    curses.init_pair(17, curses_color, -1)
-                    ui_instance.redraw_ui()
-                except Exception as e2:
-                    debug_log(f"Fallback also failed: {e2}")
-    
-    # Start color processing in background
-    thread = threading.Thread(target=process_color)
-    thread.daemon = True
-    thread.start()
-    debug_log("Color processing thread started")
+            _IN_FLIGHT_URL = None  # Even if it raised, or the album could never be asked for again
+    
+    with COLOR_LOCK:
+        # A different track came in while this one was processing, let its job set the color
+        if _LATEST_REQUEST is not None:
+            if _LATEST_REQUEST[1] != album_url:
+                log.debug("Dropping stale color for album: %s", album_url)
+                return
+            _LATEST_REQUEST = None  # Asked for the same album again, this result answers it
+        
+        log.debug("Current color: %s, New color: %s", CURRENT_COLOR, curses_color)
+        if _apply_border_color(ui_instance, curses_color):
+            _BORDER_URL = album_url
+
+def _apply_border_color(ui_instance, curses_color):
+    """Set the border color to curses_color and redraw. Call with COLOR_LOCK held.
+    
+    The color pair is changed by the UI's render thread, the only thread that
+    touches curses, on its next frame.
+    
+    Returns:
+        True if the color was handed to the UI
+    """
+    global CURRENT_COLOR
+    
+    # Always update the color pair (don't check if it's the same)
+    CURRENT_COLOR = curses_color
+    
+    try:
+        log.debug("Updating border color to: %s", curses_color)
+        ui_instance.set_border_color(curses_color)
+        return True
+    except Exception as e:
+        log.debug("Error updating color: %s", e)
+        return False
 
 # Function to be called from the main app when track changes
 def process_current_track(stdscr, ui_instance, track_data):
@@ -510,54 +659,52 @@ def process_current_track(stdscr, ui_instance, track_data):
         ui_instance: ResoniteUI instance
         track_data: Spotify track data dictionary
     """
-    debug_log("Processing current track for color extraction")
+    log.debug("Processing current track for color extraction")
     
     if not track_data:
-        debug_log("No track data provided")
+        log.debug("No track data provided")
         return
     
     if not ui_instance:
-        debug_log("No UI instance provided")
+        log.debug("No UI instance provided")
         return
         
     # Extract album art URL from track data
     album_url = None
     try:
-        debug_log("Extracting album art URL from track data")
+        log.debug("Extracting album art URL from track data")
         if "item" in track_data and track_data["item"]:
-            debug_log(f"Track item found: {track_data['item'].get('name', 'Unknown')}")
+            log.debug("Track item found: %s", track_data['item'].get('name', 'Unknown'))
             if "album" in track_data["item"] and track_data["item"]["album"]:
-                debug_log(f"Album found: {track_data['item']['album'].get('name', 'Unknown')}")
+                log.debug("Album found: %s", track_data['item']['album'].get('name', 'Unknown'))
                 if "images" in track_data["item"]["album"] and track_data["item"]["album"]["images"]:
                     # Get the medium size image (index 1) or the first available
                     if len(track_data["item"]["album"]["images"]) > 1:
                         album_url = track_data["item"]["album"]["images"][1]["url"]
                     else:
                         album_url = track_data["item"]["album"]["images"][0]["url"]
-                    debug_log(f"Album art URL extracted: {album_url}")
+                    log.debug("Album art URL extracted: %s", album_url)
                 else:
-                    debug_log("No images found in album data")
+                    log.debug("No images found in album data")
             else:
-                debug_log("No album found in track data")
+                log.debug("No album found in track data")
         else:
-            debug_log("No item found in track data")
+            log.debug("No item found in track data")
     except Exception as e:
-        debug_log(f"Error extracting album art URL: {e}")
+        log.debug("Error extracting album art URL: %s", e)
         return
     
     if album_url:
-        debug_log(f"Calling update_border_color with URL: {album_url}")
+        log.debug("Calling update_border_color with URL: %s", album_url)
         update_border_color(stdscr, ui_instance, album_url)
     else:
-        debug_log("No album URL found, skipping color update")
+        log.debug("No album URL found, skipping color update")
 
 def enable_debug():
     """Enable debug logging"""
-    global DEBUG
-    DEBUG = True
     # Clear previous log
-    with open("color_debug.log", "w") as f:
-        f.write(f"[{time.strftime('%H:%M:%S')}] Debug logging started\n")
+    _start_debug_log("w")
+    log.debug("Debug logging started")
 
 def force_update_from_url(stdscr, ui_instance, album_url, force_color=None):
     """Manually force color update from a URL - for debugging.
@@ -568,55 +715,28 @@ def force_update_from_url(stdscr, ui_instance, album_url, force_color=None):
         album_url: URL to album artwork image
         force_color: Optional color to force instead of extracting
     """
-    global CURRENT_COLOR, COLOR_LOCK, DEBUG
-    
     # Enable debugging
-    DEBUG = True
-    with open("color_debug.log", "a") as f:
-        f.write(f"[{time.strftime('%H:%M:%S')}] MANUAL COLOR TEST: Forcing color update from URL: {album_url}\n")
+    _start_debug_log("a")
+    log.debug("MANUAL COLOR TEST: Forcing color update from URL: %s", album_url)
     
     if force_color is not None:
         # Use the specified color directly
         with COLOR_LOCK:
-            CURRENT_COLOR = force_color
-            try:
-                from resonite_ui import COLOR_BORDER
-                curses.init_pair(COLOR_BORDER, force_color, -1)
-                ui_instance.redraw_ui()
-                with open("color_debug.log", "a") as f:
-                    f.write(f"[{time.strftime('%H:%M:%S')}] MANUAL COLOR TEST: Forced color {force_color} applied\n")
-            except Exception as e:
-                with open("color_debug.log", "a") as f:
-                    f.write(f"[{time.strftime('%H:%M:%S')}] MANUAL COLOR TEST: Error applying color: {e}\n")
+            if _apply_border_color(ui_instance, force_color):
+                log.debug("MANUAL COLOR TEST: Forced color %s applied", force_color)
         return
     
     # Otherwise extract from URL
     try:
-        image_data = fetch_album_art(album_url)
-        if not image_data:
-            with open("color_debug.log", "a") as f:
-                f.write(f"[{time.strftime('%H:%M:%S')}] MANUAL COLOR TEST: Failed to fetch image\n")
-            return
-            
-        # Extract dominant colors
-        dominant_colors = get_dominant_colors(image_data)
-        vibrant_color = get_saturated_color(dominant_colors)
-        curses_color = rgb_to_curses_color(vibrant_color)
-        
-        with COLOR_LOCK:
-            CURRENT_COLOR = curses_color
-            try:
-                from resonite_ui import COLOR_BORDER
-                curses.init_pair(COLOR_BORDER, curses_color, -1)
-                ui_instance.redraw_ui()
-                with open("color_debug.log", "a") as f:
-                    f.write(f"[{time.strftime('%H:%M:%S')}] MANUAL COLOR TEST: Color {curses_color} applied from RGB {vibrant_color}\n")
-            except Exception as e:
-                with open("color_debug.log", "a") as f:
-                    f.write(f"[{time.strftime('%H:%M:%S')}] MANUAL COLOR TEST: Error applying color: {e}\n")
+        vibrant_color = _extract_rgb(album_url)
     except Exception as e:
-        with open("color_debug.log", "a") as f:
-            f.write(f"[{time.strftime('%H:%M:%S')}] MANUAL COLOR TEST: Error: {e}\n")
+        log.debug("MANUAL COLOR TEST: Error: %s", e)
+        return
+    curses_color = rgb_to_curses_color(vibrant_color)
+    
+    with COLOR_LOCK:
+        if _apply_border_color(ui_instance, curses_color):
+            log.debug("MANUAL COLOR TEST: Color %s applied from RGB %s", curses_color, vibrant_color)
 
 if __name__ == "__main__":
     # Stand-alone test functionality
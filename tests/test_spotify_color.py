@@ -0,0 +1,30 @@
+from io import BytesIO
+
+import numpy as np
+from PIL import Image
+
+import spotify_color
+
+
+def _png(pixels):
+    buffer = BytesIO()
+    Image.fromarray(pixels).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def test_pick_vibrant_ignores_single_pixel_speck():
+    # Half red, half dark, with one bright green pixel in the dark half
+    pixels = np.zeros((64, 64, 3), dtype=np.uint8)
+    pixels[:32] = (200, 40, 40)
+    pixels[32:] = (20, 20, 20)
+    pixels[40, 10] = (40, 220, 0)
+    
+    assert spotify_color.pick_vibrant(_png(pixels)) == (200, 40, 40)
+
+
+def test_pick_vibrant_falls_back_to_most_common_color():
+    # Nothing pigmented, so the most common bucket is used
+    pixels = np.full((64, 64, 3), 128, dtype=np.uint8)
+    pixels[:8] = (30, 30, 30)
+    
+    assert spotify_color.pick_vibrant(_png(pixels)) == (128, 128, 128)